@@ -0,0 +1,79 @@
+# app/api/conditional.py
+"""
+ETag / Last-Modified validators for per-user collections, so list endpoints
+can answer a repeat poll with 304 Not Modified after one aggregate query.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Dict, Optional, Tuple, Type
+from fastapi import Request, Response
+from sqlalchemy import func
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.utils import get_current_timezone
+from app.models.transaction import Transaction
+from app.models.user import User
+
+# Tabel yang terlalu besar untuk count(*)/max(updated_at) per request: versi per user
+# yang dinaikkan di setiap write (app/db/bulk.py touch_transactions), O(1) lewat primary key
+USER_VERSION_COLUMNS = {
+    Transaction: (User.transactions_version, User.transactions_updated_at),
+}
+
+async def collection_validators(
+    session: AsyncSession,
+    request: Request,
+    user_id: int,
+    *models: Type[SQLModel]
+) -> Tuple[str, Optional[datetime]]:
+    """
+    Build an ETag from count(*) and max(updated_at) of the user's rows in
+    every given table plus the query string. A create or update moves
+    max(updated_at) and a delete changes the count. Tables listed in
+    USER_VERSION_COLUMNS use the user's version columns instead.
+    """
+    columns = []
+    for model in models:
+        if model in USER_VERSION_COLUMNS:
+            for column in USER_VERSION_COLUMNS[model]:
+                columns.append(select(column).where(User.id == user_id).scalar_subquery())
+            continue
+        owned = model.user_id == user_id
+        columns.append(select(func.count()).select_from(model).where(owned).scalar_subquery())
+        columns.append(select(func.max(model.updated_at)).where(owned).scalar_subquery())
+    row = (await session.exec(select(*columns))).one()
+
+    # Waktu di response ikut timezone user, jadi timezone juga bagian dari ETag
+    parts = [str(user_id), request.url.query, str(get_current_timezone())]
+    last_modified = None
+    for model, count, updated_at in zip(models, row[0::2], row[1::2]):
+        parts.append(f"{model.__tablename__}:{count}:{updated_at.isoformat() if updated_at else ''}")
+        if updated_at is not None:
+            # Kolom tanpa timezone berisi waktu UTC
+            if updated_at.tzinfo is None:
+                updated_at = updated_at.replace(tzinfo=timezone.utc)
+            if last_modified is None or updated_at > last_modified:
+                last_modified = updated_at
+
+    digest = hashlib.sha1("|".join(parts).encode()).hexdigest()
+    return f'"{digest}"', last_modified
+
+def validator_headers(etag: str, last_modified: Optional[datetime]) -> Dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+    return headers
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Weak comparison against If-None-Match, as RFC 9110 requires for GET"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [value.strip() for value in header.split(",")]
+    return "*" in candidates or any(
+        candidate.removeprefix("W/") == etag for candidate in candidates
+    )
+
+def not_modified(headers: Dict[str, str]) -> Response:
+    return Response(status_code=304, headers=headers)
@@ -1,14 +1,34 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlmodel import Session
-from app.db.session import get_session
+from sqlalchemy.orm import make_transient_to_detached
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.db.session import get_async_session
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.core.security import decode_token
+from app.core.utils import set_current_timezone
 from app.models.user import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/login")
 
+# Snapshot kolom user per user_id, hanya dipakai saat AUTH_MODE = "stateless"
+user_cache = TTLCache(
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS
+)
+
+def invalidate_cached_user(user_id: int):
+    user_cache.delete(user_id)
+
+def _user_from_snapshot(session: AsyncSession, snapshot: dict) -> User:
+    # Attach tanpa query, seolah-olah baru di-load oleh session ini
+    user = User(**snapshot)
+    make_transient_to_detached(user)
+    session.add(user)
+    return user
+
 async def get_current_user(
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     token: str = Depends(oauth2_scheme)
 ) -> User:
     credentials_exception = HTTPException(
@@ -16,17 +36,52 @@ async def get_current_user(
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
     payload = decode_token(token)
     if not payload:
         raise credentials_exception
-        
+
     user_id = payload.get("sub")
     if user_id is None:
         raise credentials_exception
-        
-    user = session.get(User, int(user_id))
+    user_id = int(user_id)
+
+    if settings.AUTH_MODE == "stateless":
+        if not payload.get("act", False):
+            raise credentials_exception
+
+        snapshot = user_cache.get(user_id)
+        if snapshot is not None:
+            if snapshot["token_version"] == payload.get("ver") and snapshot["is_active"]:
+                user = _user_from_snapshot(session, snapshot)
+                set_current_timezone(user.timezone)
+                return user
+            # Snapshot bisa basi (password diganti di worker lain), database yang memutuskan
+            invalidate_cached_user(user_id)
+
+    user = await session.get(User, user_id)
     if not user:
         raise credentials_exception
-        
-    return user
\ No newline at end of file
+
+    # Token dari sebelum claim "ver" ditambahkan tetap diterima di mode database
+    if "ver" in payload and payload["ver"] != user.token_version:
+        raise credentials_exception
+
+    if settings.AUTH_MODE == "stateless":
+        if not user.is_active:
+            raise credentials_exception
+        user_cache.set(user_id, user.model_dump())
+
+    # Dipakai to_local_time saat response user ini diserialisasi
+    set_current_timezone(user.timezone)
+    return user
+
+async def get_current_superuser(
+    current_user: User = Depends(get_current_user)
+) -> User:
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough privileges"
+        )
+    return current_user
@@ -0,0 +1,73 @@
+# app/api/prometheus.py
+from fastapi import APIRouter, Response
+from app.api.deps import user_cache
+from app.core.prometheus import CONTENT_TYPE, MetricWriter, write_request_metrics
+from app.core.response_cache import bank_list_cache, category_list_cache
+from app.core.security import hashing_stats
+from app.db.balances import balance_history_cache
+from app.db.session import engine, async_engine
+
+router = APIRouter()
+
+def _write_pool_metrics(writer: MetricWriter):
+    pools = {"async": async_engine.pool.metrics(), "sync": engine.pool.metrics()}
+    writer.family("floo_db_pool_size", "gauge", "Configured connection pool size", (
+        ({"pool": name}, pool["pool_size"]) for name, pool in pools.items()
+    ))
+    writer.family("floo_db_pool_connections", "gauge", "Pool connections by state", (
+        ({"pool": name, "state": state}, pool[state])
+        for name, pool in pools.items() for state in ("checked_out", "checked_in", "overflow")
+    ))
+    writer.family("floo_db_pool_checkouts_total", "counter", "Successful connection checkouts", (
+        ({"pool": name}, pool["checkouts"]) for name, pool in pools.items()
+    ))
+    writer.family("floo_db_pool_checkout_timeouts_total", "counter", "Checkouts that hit DB_POOL_TIMEOUT", (
+        ({"pool": name}, pool["timeouts"]) for name, pool in pools.items()
+    ))
+    writer.family("floo_db_pool_checkout_wait_seconds_total", "counter", "Time spent waiting for a connection", (
+        ({"pool": name}, pool["wait_total_ms"] / 1000) for name, pool in pools.items()
+    ))
+
+def _write_hashing_metrics(writer: MetricWriter):
+    stats = hashing_stats.snapshot()
+    writer.family("floo_password_hash_queue_depth", "gauge", "bcrypt jobs waiting for a worker", [
+        ({}, stats["queue_depth"])
+    ])
+    writer.family("floo_password_hash_running", "gauge", "bcrypt jobs running", [({}, stats["running"])])
+    writer.family("floo_password_hash_rejected_total", "counter", "bcrypt jobs rejected because the queue was full", [
+        ({}, stats["rejected"])
+    ])
+    writer.summary(
+        "floo_password_hash_queue_wait_seconds", "Time bcrypt jobs waited in the queue before running",
+        stats["queue_wait_total_ms"] / 1000, stats["completed"] + stats["running"]
+    )
+
+def _write_cache_metrics(writer: MetricWriter):
+    caches = {
+        "banks": bank_list_cache,
+        "categories": category_list_cache,
+        "balance_history": balance_history_cache,
+        "users": user_cache,  # Hanya dipakai saat AUTH_MODE=stateless
+    }
+    writer.family("floo_cache_requests_total", "counter", "Cache lookups by result", (
+        sample
+        for name, cache in caches.items()
+        for sample in (({"cache": name, "result": "hit"}, cache.hits), ({"cache": name, "result": "miss"}, cache.misses))
+    ))
+    writer.family("floo_cache_hit_ratio", "gauge", "Cache hits / lookups since the worker started", (
+        ({"cache": name}, cache.hits / (cache.hits + cache.misses) if cache.hits + cache.misses else 0.0)
+        for name, cache in caches.items()
+    ))
+
+@router.get("/metrics", include_in_schema=False)
+async def get_prometheus_metrics():
+    """
+    Prometheus scrape endpoint. Per worker process; with several workers
+    scrape each one or use a single worker per container.
+    """
+    writer = MetricWriter()
+    write_request_metrics(writer)
+    _write_pool_metrics(writer)
+    _write_hashing_metrics(writer)
+    _write_cache_metrics(writer)
+    return Response(content=writer.render(), media_type=CONTENT_TYPE)
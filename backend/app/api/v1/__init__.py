@@ -2,4 +2,6 @@ from app.api.v1.auth import router as auth
 from app.api.v1.users import router as users
 from app.api.v1.banks import router as banks
 from app.api.v1.categories import router as categories
-from app.api.v1.transactions import router as transactions
\ No newline at end of file
+from app.api.v1.transactions import router as transactions
+from app.api.v1.metrics import router as metrics
+from app.api.v1.admin import router as admin
\ No newline at end of file
@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.db.session import get_async_session
+from app.db.balances import reconcile_balances
+from app.models.user import User
+from app.api.deps import get_current_superuser
+import logging
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+@router.post("/reconcile-balances")
+async def reconcile_bank_balances(
+    *,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_superuser),
+    dry_run: bool = False,
+    chunk_size: int = 1000,
+    user_id: int = None
+):
+    """
+    Recompute every bank's end_balance from start_balance and its transactions
+    and report the drift that was found
+    """
+    try:
+        report = await session.run_sync(
+            lambda sync_session: reconcile_balances(
+                sync_session, chunk_size=chunk_size, dry_run=dry_run, user_id=user_id
+            )
+        )
+        logger.info(
+            f"Balance reconciliation by user {current_user.id}: "
+            f"{report['banks_drifted']} of {report['banks_checked']} banks drifted, dry_run={dry_run}"
+        )
+        return report
+    except Exception as e:
+        logger.error(f"Error reconciling balances: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error reconciling balances: {str(e)}"
+        )
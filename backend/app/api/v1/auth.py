@@ -1,30 +1,31 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlmodel import Session, select
-from datetime import datetime, timedelta
-import pytz
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from datetime import timedelta
 import logging
-from app.core.security import verify_password, create_access_token, get_password_hash
-from app.db.session import get_session
+from app.core.security import (
+    verify_password_async, create_access_token, get_password_hash_async,
+    get_token_claims, PasswordHashingBusyError
+)
+from app.db.session import get_async_session
 from app.models.user import User, UserCreate, UserRead
 from app.core.config import settings
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-jakarta_tz = pytz.timezone('Asia/Jakarta')
-
 @router.post("/register", response_model=UserRead)
 async def register(
     *, 
-    session: Session = Depends(get_session), 
+    session: AsyncSession = Depends(get_async_session), 
     user_in: UserCreate
 ):
     try:
         # Check username
-        user = session.exec(
+        user = (await session.exec(
             select(User).where(User.username == user_in.username)
-        ).first()
+        )).first()
         if user:
             raise HTTPException(
                 status_code=400,
@@ -32,36 +33,39 @@ async def register(
             )
         
         # Check email
-        user = session.exec(
+        user = (await session.exec(
             select(User).where(User.email == user_in.email)
-        ).first()
+        )).first()
         if user:
             raise HTTPException(
                 status_code=400,
                 detail="Email already registered"
             )
         
-        current_time = datetime.now(jakarta_tz)
-        
         # Create new user
         db_user = User(
             fullname=user_in.fullname,
             username=user_in.username,
             email=user_in.email,
-            password=get_password_hash(user_in.password),
-            created_at=current_time,
-            updated_at=current_time
+            password=await get_password_hash_async(user_in.password),
+            timezone=user_in.timezone
         )
         
         session.add(db_user)
-        session.commit()
-        session.refresh(db_user)
+        await session.commit()
+        await session.refresh(db_user)
         
         logger.info(f"User registered successfully: {user_in.username}")
         return db_user
         
     except HTTPException:
         raise
+    except PasswordHashingBusyError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please try again",
+            headers={"Retry-After": "1"}
+        )
     except Exception as e:
         logger.error(f"Registration error: {str(e)}")
         raise HTTPException(
@@ -71,18 +75,18 @@ async def register(
 
 @router.post("/login", response_model=dict)
 async def login(
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     form_data: OAuth2PasswordRequestForm = Depends()
 ):
     """
     OAuth2 compatible token login, get an access token for future requests
     """
     try:
-        user = session.exec(
+        user = (await session.exec(
             select(User).where(User.username == form_data.username)
-        ).first()
+        )).first()
         
-        if not user or not verify_password(form_data.password, user.password):
+        if not user or not await verify_password_async(form_data.password, user.password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect username or password",
@@ -97,7 +101,7 @@ async def login(
         
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = create_access_token(
-            data={"sub": str(user.id)}, 
+            data=get_token_claims(user), 
             expires_delta=access_token_expires
         )
         
@@ -109,6 +113,12 @@ async def login(
         
     except HTTPException:
         raise
+    except PasswordHashingBusyError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please try again",
+            headers={"Retry-After": "1"}
+        )
     except Exception as e:
         logger.error(f"Login error: {str(e)}")
         raise HTTPException(
@@ -1,20 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from pydantic import TypeAdapter
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List
-from app.db.session import get_session
-from app.models.bank import Bank, BankCreate, BankRead, BankUpdate
+from datetime import date, timedelta
+from app.db.session import get_async_session
+from app.models.bank import Bank, BankCreate, BankRead, BankUpdate, BankBalancePoint
 from app.models.user import User
 from app.api.deps import get_current_user
-from app.core.utils import get_utc_now
+from app.api.conditional import collection_validators, etag_matches, not_modified, validator_headers
+from app.core.utils import get_utc_now, local_today
+from app.core.response_cache import CACHE_STATUS_HEADER, bank_list_cache
+from app.core.config import settings
+from app.db.balances import get_balance_history
 import logging
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+_banks_adapter = TypeAdapter(List[BankRead])
+
 @router.post("/", response_model=BankRead)
 async def create_bank(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     bank_in: BankCreate,
     current_user: User = Depends(get_current_user)
 ):
@@ -26,8 +35,8 @@ async def create_bank(
         )
         
         session.add(db_bank)
-        session.commit()
-        session.refresh(db_bank)
+        await session.commit()
+        await session.refresh(db_bank)
         
         logger.info(f"Bank created successfully: {db_bank.id}")
         return db_bank
@@ -41,17 +50,39 @@ async def create_bank(
 @router.get("/", response_model=List[BankRead])
 async def get_banks(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user),
+    request: Request,
     skip: int = 0,
     limit: int = 100
 ):
     try:
-        # Filter banks by current user
-        query = select(Bank).where(Bank.user_id == current_user.id)
-        query = query.offset(skip).limit(limit)
-        banks = session.exec(query).all()
-        return banks
+        # Poll berulang cukup satu query agregat tanpa serialisasi
+        headers = validator_headers(
+            *await collection_validators(session, request, current_user.id, Bank)
+        )
+        if etag_matches(request, headers["ETag"]):
+            return not_modified(headers)
+
+        body = await bank_list_cache.lookup(current_user.id, headers["ETag"])
+        cache_status = "HIT"
+        if body is None:
+            # Filter banks by current user
+            query = select(Bank).where(Bank.user_id == current_user.id)
+            query = query.offset(skip).limit(limit)
+            banks = (await session.exec(query)).all()
+            body = _banks_adapter.dump_json(
+                [BankRead.model_validate(row) for row in banks]
+            )
+            await bank_list_cache.store(current_user.id, headers["ETag"], body)
+            cache_status = "MISS"
+
+        # Body sudah berupa JSON, jadi response_model tidak memvalidasi ulang
+        return Response(
+            content=body,
+            media_type="application/json",
+            headers={**headers, CACHE_STATUS_HEADER: cache_status}
+        )
     except Exception as e:
         logger.error(f"Error retrieving banks: {e}")
         raise HTTPException(
@@ -62,12 +93,12 @@ async def get_banks(
 @router.get("/{bank_id}", response_model=BankRead)
 async def get_bank(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     bank_id: int,
     current_user: User = Depends(get_current_user)
 ):
     try:
-        bank = session.get(Bank, bank_id)
+        bank = await session.get(Bank, bank_id)
         if not bank:
             raise HTTPException(status_code=404, detail="Bank not found")
         
@@ -85,16 +116,57 @@ async def get_bank(
             detail=f"Error retrieving bank: {str(e)}"
         )
 
+@router.get("/{bank_id}/balance-history", response_model=List[BankBalancePoint])
+async def get_bank_balance_history(
+    *,
+    session: AsyncSession = Depends(get_async_session),
+    bank_id: int,
+    current_user: User = Depends(get_current_user),
+    start_date: date = None,
+    end_date: date = None
+):
+    """
+    Closing balance of the bank for each day in the range (default: last 30 days)
+    """
+    try:
+        bank = await session.get(Bank, bank_id)
+        if not bank:
+            raise HTTPException(status_code=404, detail="Bank not found")
+
+        # Verify bank belongs to current user
+        if bank.user_id != current_user.id:
+            raise HTTPException(status_code=403, detail="Not authorized to access this bank")
+
+        end_date = end_date or local_today()
+        start_date = start_date or end_date - timedelta(days=29)
+        if start_date > end_date:
+            raise HTTPException(status_code=400, detail="start_date must not be after end_date")
+        if (end_date - start_date).days >= settings.BALANCE_HISTORY_MAX_DAYS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Date range is limited to {settings.BALANCE_HISTORY_MAX_DAYS} days"
+            )
+
+        return await get_balance_history(session, bank, start_date, end_date)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error retrieving balance history: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error retrieving balance history: {str(e)}"
+        )
+
 @router.patch("/{bank_id}", response_model=BankRead)
 async def update_bank(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     bank_id: int,
     bank_update: BankUpdate,
     current_user: User = Depends(get_current_user)
 ):
     try:
-        bank = session.get(Bank, bank_id)
+        bank = await session.get(Bank, bank_id)
         if not bank:
             raise HTTPException(status_code=404, detail="Bank not found")
             
@@ -110,8 +182,8 @@ async def update_bank(
         bank.updated_at = get_utc_now()
 
         session.add(bank)
-        session.commit()
-        session.refresh(bank)
+        await session.commit()
+        await session.refresh(bank)
         
         logger.info(f"Bank updated successfully: {bank.id}")
         return bank
@@ -127,12 +199,12 @@ async def update_bank(
 @router.delete("/{bank_id}")
 async def delete_bank(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     bank_id: int,
     current_user: User = Depends(get_current_user)
 ):
     try:
-        bank = session.get(Bank, bank_id)
+        bank = await session.get(Bank, bank_id)
         if not bank:
             raise HTTPException(status_code=404, detail="Bank not found")
             
@@ -140,8 +212,8 @@ async def delete_bank(
         if bank.user_id != current_user.id:
             raise HTTPException(status_code=403, detail="Not authorized to delete this bank")
 
-        session.delete(bank)
-        session.commit()
+        await session.delete(bank)
+        await session.commit()
         
         logger.info(f"Bank deleted successfully: {bank_id}")
         return {"message": "Bank deleted successfully"}
@@ -1,20 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from pydantic import TypeAdapter
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List
-from app.db.session import get_session
+from app.db.session import get_async_session
 from app.models.category import Category, CategoryCreate, CategoryRead, CategoryUpdate
 from app.models.user import User
 from app.api.deps import get_current_user
+from app.api.conditional import collection_validators, etag_matches, not_modified, validator_headers
 from app.core.utils import get_utc_now
+from app.db.balances import touch_category_banks
+from app.core.response_cache import CACHE_STATUS_HEADER, category_list_cache
 import logging
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+_categories_adapter = TypeAdapter(List[CategoryRead])
+
 @router.post("/", response_model=CategoryRead)
 async def create_category(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     category_in: CategoryCreate,
     current_user: User = Depends(get_current_user)
 ):
@@ -26,8 +33,8 @@ async def create_category(
         )
         
         session.add(db_category)
-        session.commit()
-        session.refresh(db_category)
+        await session.commit()
+        await session.refresh(db_category)
         
         logger.info(f"Category created successfully: {db_category.id}")
         return db_category
@@ -41,17 +48,39 @@ async def create_category(
 @router.get("/", response_model=List[CategoryRead])
 async def get_categories(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user),
+    request: Request,
     skip: int = 0,
     limit: int = 100
 ):
     try:
-        # Filter categories by current user
-        query = select(Category).where(Category.user_id == current_user.id)
-        query = query.offset(skip).limit(limit)
-        categories = session.exec(query).all()
-        return categories
+        # Poll berulang cukup satu query agregat tanpa serialisasi
+        headers = validator_headers(
+            *await collection_validators(session, request, current_user.id, Category)
+        )
+        if etag_matches(request, headers["ETag"]):
+            return not_modified(headers)
+
+        body = await category_list_cache.lookup(current_user.id, headers["ETag"])
+        cache_status = "HIT"
+        if body is None:
+            # Filter categories by current user
+            query = select(Category).where(Category.user_id == current_user.id)
+            query = query.offset(skip).limit(limit)
+            categories = (await session.exec(query)).all()
+            body = _categories_adapter.dump_json(
+                [CategoryRead.model_validate(row) for row in categories]
+            )
+            await category_list_cache.store(current_user.id, headers["ETag"], body)
+            cache_status = "MISS"
+
+        # Body sudah berupa JSON, jadi response_model tidak memvalidasi ulang
+        return Response(
+            content=body,
+            media_type="application/json",
+            headers={**headers, CACHE_STATUS_HEADER: cache_status}
+        )
     except Exception as e:
         logger.error(f"Error retrieving categories: {e}")
         raise HTTPException(
@@ -62,12 +91,12 @@ async def get_categories(
 @router.get("/{category_id}", response_model=CategoryRead)
 async def get_category(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     category_id: int,
     current_user: User = Depends(get_current_user)
 ):
     try:
-        category = session.get(Category, category_id)
+        category = await session.get(Category, category_id)
         if not category:
             raise HTTPException(status_code=404, detail="Category not found")
         
@@ -88,13 +117,13 @@ async def get_category(
 @router.patch("/{category_id}", response_model=CategoryRead)
 async def update_category(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     category_id: int,
     category_update: CategoryUpdate,
     current_user: User = Depends(get_current_user)
 ):
     try:
-        category = session.get(Category, category_id)
+        category = await session.get(Category, category_id)
         if not category:
             raise HTTPException(status_code=404, detail="Category not found")
             
@@ -104,14 +133,17 @@ async def update_category(
 
         # Update category fields
         update_data = category_update.dict(exclude_unset=True)
+        if update_data.get("is_income", category.is_income) != category.is_income:
+            # Tanda transaksinya ikut berubah, balance history bank terkait jadi basi
+            await touch_category_banks(session, category.id)
         for field, value in update_data.items():
             setattr(category, field, value)
 
         category.updated_at = get_utc_now()
 
         session.add(category)
-        session.commit()
-        session.refresh(category)
+        await session.commit()
+        await session.refresh(category)
         
         logger.info(f"Category updated successfully: {category.id}")
         return category
@@ -127,12 +159,12 @@ async def update_category(
 @router.delete("/{category_id}")
 async def delete_category(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     category_id: int,
     current_user: User = Depends(get_current_user)
 ):
     try:
-        category = session.get(Category, category_id)
+        category = await session.get(Category, category_id)
         if not category:
             raise HTTPException(status_code=404, detail="Category not found")
             
@@ -140,8 +172,9 @@ async def delete_category(
         if category.user_id != current_user.id:
             raise HTTPException(status_code=403, detail="Not authorized to delete this category")
 
-        session.delete(category)
-        session.commit()
+        await touch_category_banks(session, category.id)
+        await session.delete(category)
+        await session.commit()
         
         logger.info(f"Category deleted successfully: {category_id}")
         return {"message": "Category deleted successfully"}
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends
+from app.api.deps import get_current_superuser
+from app.core.security import hashing_stats
+from app.core.timing import route_stats
+from app.db.session import engine, async_engine
+from app.models.user import User
+import logging
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+@router.get("/pool")
+async def get_pool_metrics(current_user: User = Depends(get_current_superuser)):
+    """
+    Connection pool usage, for sizing DB_POOL_SIZE and DB_MAX_OVERFLOW
+    """
+    return {
+        "async": async_engine.pool.metrics(),
+        "sync": engine.pool.metrics()
+    }
+
+@router.get("/hashing")
+async def get_hashing_metrics(current_user: User = Depends(get_current_superuser)):
+    """
+    Password hashing pool usage (bcrypt queue depth and wait times)
+    """
+    return hashing_stats.snapshot()
+
+@router.get("/requests")
+async def get_request_metrics(current_user: User = Depends(get_current_superuser)):
+    """
+    Per-route request count, wall time, SQL statements, DB time and rows
+    returned, since the worker started
+    """
+    return route_stats.snapshot()
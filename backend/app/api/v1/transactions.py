@@ -1,38 +1,138 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, UploadFile, File, Form
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import case, func, tuple_
+from sqlalchemy.orm import joinedload, raiseload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List
-from datetime import date
-from app.db.session import get_session
-from app.models.transaction import Transaction, TransactionCreate, TransactionRead, TransactionUpdate
+from datetime import date, datetime, timedelta
+from enum import Enum
+from collections import defaultdict
+import csv
+import io
+import itertools
+import json
+from app.db.session import get_async_session, async_session_factory
+from app.models.transaction import (
+    Transaction, TransactionCreate, TransactionRead, TransactionReadExpanded, TransactionUpdate,
+    SummaryInterval, PeriodSummary, CategorySummary, BankSummary
+)
 from app.models.bank import Bank
+from app.models.rollup import TransactionRollup
 from app.models.category import Category
 from app.models.user import User
 from app.api.deps import get_current_user
-from app.core.utils import get_utc_now
+from app.api.conditional import collection_validators, etag_matches, not_modified, validator_headers
+from app.core.utils import get_utc_now, to_local_time
+from app.core.responses import LocalTimeJSONResponse, model_rows
+from app.core.pagination import NEXT_CURSOR_HEADER, encode_cursor, decode_cursor
+from app.core.config import settings
+from app.core.statements import StatementRowError, parse_csv, parse_ofx
+from app.db.functions import period_start
+from app.db.rollups import add_rollup_delta, apply_rollup_deltas
+from app.db.bulk import get_owned_by_ids, insert_transactions, touch_transactions
+from app.db.balances import apply_balance_deltas, touch_banks
 import logging
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+def _use_rollups(start_date: date, end_date: date) -> bool:
+    """Monthly rollups can answer a query whose date range covers whole months"""
+    starts_on_month = start_date is None or start_date.day == 1
+    ends_on_month = end_date is None or (end_date + timedelta(days=1)).day == 1
+    return starts_on_month and ends_on_month
+
+def _summary_query(group_columns, use_rollups: bool):
+    """
+    Select group_columns plus income, expense and count aggregates, over
+    either raw transactions or the monthly rollup table
+    """
+    if use_rollups:
+        source, amount = TransactionRollup, TransactionRollup.total_amount
+        count = func.coalesce(func.sum(TransactionRollup.count), 0)
+    else:
+        source, amount = Transaction, Transaction.amount
+        count = func.count(Transaction.id)
+
+    income = func.coalesce(func.sum(case((Category.is_income, amount), else_=0)), 0)
+    expense = func.coalesce(func.sum(case((Category.is_income, 0), else_=amount)), 0)
+    query = (
+        select(*group_columns, income.label("income"), expense.label("expense"), count.label("count"))
+        .select_from(source)
+        .join(Category, Category.id == source.category_id)
+        .group_by(*group_columns)
+    )
+    if use_rollups:
+        # Bucket yang semua transaksinya sudah dihapus tetap ada dengan count 0
+        query = query.having(count > 0)
+    return query
+
+def _filter_transactions(
+    query, user_id, start_date, end_date, category_id, bank_id, use_rollups: bool = False
+):
+    """Apply the common list filters to a query over transactions (or monthly rollups)"""
+    source = TransactionRollup if use_rollups else Transaction
+    day = TransactionRollup.month if use_rollups else Transaction.date
+
+    query = query.where(source.user_id == user_id)
+    if start_date:
+        query = query.where(day >= start_date)
+    if end_date:
+        query = query.where(day <= end_date)
+    if category_id:
+        query = query.where(source.category_id == category_id)
+    if bank_id:
+        query = query.where(source.bank_id == bank_id)
+    return query
+
+EXPANDABLE_RELATIONS = {"category": Transaction.category, "bank": Transaction.bank}
+EXPANDABLE_MODELS = {"category": Category, "bank": Bank}
+
+async def _get_transaction_for_write(
+    session: AsyncSession, transaction_id: int, user_id: int
+) -> Transaction:
+    """Load a transaction with its category and bank in one joined query"""
+    query = (
+        select(Transaction)
+        .options(joinedload(Transaction.category), joinedload(Transaction.bank))
+        .where(Transaction.id == transaction_id)
+    )
+    transaction = (await session.exec(query)).first()
+    if not transaction:
+        raise HTTPException(status_code=404, detail="Transaction not found")
+    if transaction.user_id != user_id:
+        raise HTTPException(status_code=403, detail="Not authorized to modify this transaction")
+    return transaction
+
+def _summary_totals(row) -> dict:
+    return {
+        "income": row.income,
+        "expense": row.expense,
+        "net": row.income - row.expense,
+        "count": row.count
+    }
+
 @router.post("/", response_model=TransactionRead)
 async def create_transaction(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     transaction_in: TransactionCreate,
     current_user: User = Depends(get_current_user)
 ):
     try:
-        # Verify category exists
-        category = session.get(Category, transaction_in.category_id)
-        if not category:
+        # Verify category exists and belongs to current user
+        category = await session.get(Category, transaction_in.category_id)
+        if not category or category.user_id != current_user.id:
             raise HTTPException(
                 status_code=404,
                 detail="Category not found"
             )
 
-        # Verify bank exists
-        bank = session.get(Bank, transaction_in.bank_id)
-        if not bank:
+        # Verify bank exists and belongs to current user
+        bank = await session.get(Bank, transaction_in.bank_id)
+        if not bank or bank.user_id != current_user.id:
             raise HTTPException(
                 status_code=404,
                 detail="Bank not found"
@@ -44,18 +144,21 @@ async def create_transaction(
             user_id=current_user.id  # Set user_id dari current_user
         )
 
-        # Update bank balance
-        if category.is_income:
-            bank.end_balance += transaction_in.amount
-        else:
-            bank.end_balance -= transaction_in.amount
-        
-        bank.updated_at = get_utc_now()
+        # Update bank balance secara atomik di database, bukan read-modify-write
+        delta = transaction_in.amount if category.is_income else -transaction_in.amount
+        await apply_balance_deltas(session, {bank.id: delta})
+
+        rollup_deltas = {}
+        add_rollup_delta(
+            rollup_deltas, current_user.id, db_transaction.bank_id,
+            db_transaction.category_id, db_transaction.date, db_transaction.amount, 1
+        )
+        await apply_rollup_deltas(session, rollup_deltas)
+        await touch_transactions(session, current_user.id)
         
         session.add(db_transaction)
-        session.add(bank)
-        session.commit()
-        session.refresh(db_transaction)
+        await session.commit()
+        await session.refresh(db_transaction)
         
         logger.info(f"Transaction created successfully: {db_transaction.id}")
         return db_transaction
@@ -68,34 +171,280 @@ async def create_transaction(
             detail=f"Error creating transaction: {str(e)}"
         )
 
-@router.get("/", response_model=List[TransactionRead])
+@router.post("/bulk")
+async def create_transactions_bulk(
+    *,
+    session: AsyncSession = Depends(get_async_session),
+    transactions_in: List[TransactionCreate],
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Create many transactions in one request and one database commit.
+    Either every transaction is created or none is.
+    """
+    try:
+        categories = await get_owned_by_ids(
+            session, Category, current_user.id, {t.category_id for t in transactions_in}
+        )
+        missing = sorted({t.category_id for t in transactions_in} - categories.keys())
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Categories not found: {missing}")
+
+        banks = await get_owned_by_ids(
+            session, Bank, current_user.id, {t.bank_id for t in transactions_in}
+        )
+        missing = sorted({t.bank_id for t in transactions_in} - banks.keys())
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Banks not found: {missing}")
+
+        created = await insert_transactions(session, current_user.id, transactions_in, categories)
+        await session.commit()
+
+        logger.info(f"Bulk created {created} transactions for user {current_user.id}")
+        return {"message": "Transactions created successfully", "created": created}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error creating transactions: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error creating transactions: {str(e)}"
+        )
+
+@router.post("/import")
+async def import_statement(
+    *,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+    file: UploadFile = File(...),
+    bank_id: int = Form(...),
+    file_format: str = Form(None),
+    income_category: str = Form(None),
+    expense_category: str = Form(None),
+    dry_run: bool = Form(False)
+):
+    """
+    Import a CSV or OFX bank statement into one bank.
+
+    The file is parsed in chunks in the threadpool and written in batches
+    of IMPORT_BATCH_SIZE, each batch in its own commit. If a batch fails,
+    the 500 response reports how many rows were already imported and the
+    line to resume from, so a retry does not duplicate them. CSV rows are matched
+    to categories by the optional `category` column (by name), and the
+    amount's sign must match the category's type; rows without one, and
+    all OFX rows, fall back to `income_category` or
+    `expense_category` depending on the sign of the amount. Rows that
+    cannot be imported are skipped and reported with their line number.
+    With dry_run nothing is written.
+    """
+    try:
+        bank = await session.get(Bank, bank_id)
+        if not bank or bank.user_id != current_user.id:
+            raise HTTPException(status_code=404, detail="Bank not found")
+
+        file_format = (file_format or (file.filename or "").rsplit(".", 1)[-1]).lower()
+        parsers = {"csv": parse_csv, "ofx": parse_ofx, "qfx": parse_ofx}
+        if file_format not in parsers:
+            raise HTTPException(status_code=400, detail="Unsupported file format, use csv or ofx")
+
+        # Kategori user biasanya sedikit, jadi cukup dimuat sekali
+        categories = {
+            category.name.strip().lower(): category
+            for category in (await session.exec(
+                select(Category).where(Category.user_id == current_user.id)
+            )).all()
+        }
+        categories_by_id = {category.id: category for category in categories.values()}
+        defaults = {}
+        for is_income, name in ((True, income_category), (False, expense_category)):
+            if name:
+                if name.strip().lower() not in categories:
+                    raise HTTPException(status_code=404, detail=f"Category not found: {name}")
+                defaults[is_income] = categories[name.strip().lower()]
+
+        imported = 0
+        failed = 0
+        errors = []
+        batch = []
+        batch_line = None  # Baris pertama batch yang belum di-commit
+
+        def report(line: int, error: str):
+            nonlocal failed
+            failed += 1
+            if len(errors) < settings.IMPORT_MAX_ERRORS:
+                errors.append({"line": line, "error": error})
+
+        async def flush():
+            nonlocal imported, batch_line
+            if not batch:
+                return
+            if not dry_run:
+                try:
+                    await insert_transactions(session, current_user.id, batch, categories_by_id)
+                    await session.commit()
+                except Exception as e:
+                    await session.rollback()
+                    logger.error(
+                        f"Statement import for user {current_user.id} failed at line {batch_line} "
+                        f"after {imported} rows were imported: {e}"
+                    )
+                    raise HTTPException(status_code=500, detail={
+                        "message": f"Error importing statement: {str(e)}",
+                        "imported": imported,
+                        "resume_from_line": batch_line
+                    })
+            imported += len(batch)
+            batch.clear()
+            batch_line = None
+
+        stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", errors="replace", newline="")
+        rows = parsers[file_format](stream)
+
+        def next_chunk():
+            # Baca file dan parsing di threadpool supaya event loop tidak terblokir
+            return list(itertools.islice(rows, settings.IMPORT_BATCH_SIZE))
+
+        while chunk := await run_in_threadpool(next_chunk):
+            for row in chunk:
+                if isinstance(row, StatementRowError):
+                    report(row.line, row.error)
+                    continue
+
+                if row.category:
+                    category = categories.get(row.category.lower())
+                    if category is None:
+                        report(row.line, f"Category not found: {row.category}")
+                        continue
+                    # Jumlah disimpan tanpa tanda, jadi tandanya harus cocok dengan jenis kategori
+                    if (row.amount < 0 and category.is_income) or (row.amount > 0 and not category.is_income):
+                        kind = "income" if category.is_income else "expense"
+                        report(row.line, f"Amount sign does not match {kind} category: {row.category}")
+                        continue
+                else:
+                    category = defaults.get(row.amount > 0)
+                    if category is None:
+                        report(row.line, "No category given and no default category for this amount")
+                        continue
+
+                try:
+                    batch.append(TransactionCreate(
+                        date=row.date,
+                        amount=abs(row.amount),
+                        description=row.description[:255],
+                        category_id=category.id,
+                        bank_id=bank.id
+                    ))
+                except ValueError as e:
+                    report(row.line, str(e))
+                    continue
+                if batch_line is None:
+                    batch_line = row.line
+
+                if len(batch) >= settings.IMPORT_BATCH_SIZE:
+                    await flush()
+
+        await flush()
+        stream.detach()
+
+        logger.info(
+            f"Statement import for user {current_user.id}: "
+            f"{imported} imported, {failed} failed, dry_run={dry_run}"
+        )
+        return {
+            "dry_run": dry_run,
+            "imported": imported,
+            "failed": failed,
+            "errors": errors
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error importing statement: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error importing statement: {str(e)}"
+        )
+
+@router.get("/", response_model=List[TransactionReadExpanded], response_model_exclude_none=True)
 async def get_transactions(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user),
+    request: Request,
     skip: int = 0,
     limit: int = 100,
+    cursor: str = None,
+    expand: str = None,
     start_date: date = None,
     end_date: date = None,
     category_id: int = None,
     bank_id: int = None
 ):
+    """
+    List transactions, newest first.
+
+    Pass the X-Next-Cursor response header back as `cursor` to fetch the
+    next page; cursor pages cost the same regardless of depth and `skip`
+    is ignored when a cursor is given.
+
+    `expand=category,bank` embeds the related category and/or bank in each
+    row, loaded in the same query.
+    """
     try:
+        relations = {name.strip() for name in (expand or "").split(",") if name.strip()}
+        unknown = relations - EXPANDABLE_RELATIONS.keys()
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Cannot expand: {', '.join(sorted(unknown))}"
+            )
+
+        # Row yang di-expand ikut menentukan isi response, jadi ikut di ETag
+        headers = validator_headers(*await collection_validators(
+            session, request, current_user.id,
+            Transaction, *(EXPANDABLE_MODELS[name] for name in sorted(relations))
+        ))
+        if etag_matches(request, headers["ETag"]):
+            return not_modified(headers)
+
         # Start with base query filtering by current user
-        query = select(Transaction).where(Transaction.user_id == current_user.id)
-
-        if start_date:
-            query = query.where(Transaction.date >= start_date)
-        if end_date:
-            query = query.where(Transaction.date <= end_date)
-        if category_id:
-            query = query.where(Transaction.category_id == category_id)
-        if bank_id:
-            query = query.where(Transaction.bank_id == bank_id)
-
-        query = query.offset(skip).limit(limit).order_by(Transaction.date.desc())
-        transactions = session.exec(query).all()
-        return transactions
+        query = _filter_transactions(
+            select(Transaction), current_user.id, start_date, end_date, category_id, bank_id
+        )
+
+        if cursor:
+            try:
+                cursor_date, cursor_id = decode_cursor(cursor)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            query = query.where(
+                tuple_(Transaction.date, Transaction.id) < tuple_(cursor_date, cursor_id)
+            )
+        else:
+            query = query.offset(skip)
+
+        # Relasi yang tidak di-expand tidak boleh lazy load (tidak bisa di async);
+        # model_rows membaca __dict__, jadi relasi yang tidak dimuat dilewati
+        query = query.options(*(
+            joinedload(relation) if name in relations else raiseload(relation)
+            for name, relation in EXPANDABLE_RELATIONS.items()
+        ))
+
+        # id sebagai tie-breaker supaya urutan stabil untuk tanggal yang sama
+        query = query.order_by(Transaction.date.desc(), Transaction.id.desc()).limit(limit)
+        transactions = (await session.exec(query)).all()
+
+        if transactions and len(transactions) == limit:
+            last = transactions[-1]
+            headers[NEXT_CURSOR_HEADER] = encode_cursor(last.date, last.id)
+
+        # Langsung dari ORM ke JSON; response_model hanya untuk dokumentasi
+        return LocalTimeJSONResponse(
+            content=model_rows(transactions, TransactionReadExpanded, exclude_none=True),
+            headers=headers
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error retrieving transactions: {e}")
         raise HTTPException(
@@ -103,15 +452,189 @@ async def get_transactions(
             detail=f"Error retrieving transactions: {str(e)}"
         )
 
+class ExportFormat(str, Enum):
+    csv = "csv"
+    ndjson = "ndjson"
+
+EXPORT_COLUMNS = (
+    "id", "date", "amount", "description", "category_id", "bank_id", "created_at", "updated_at"
+)
+EXPORT_CHUNK_ROWS = 1000
+
+def _export_value(value):
+    if isinstance(value, datetime):
+        return to_local_time(value).isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+async def _stream_export(query, export_format: ExportFormat):
+    # Session sendiri karena session dari dependency sudah ditutup saat body di-stream
+    async with async_session_factory() as session:
+        result = await session.stream(query.execution_options(yield_per=EXPORT_CHUNK_ROWS))
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if export_format == ExportFormat.csv:
+            writer.writerow(EXPORT_COLUMNS)
+
+        async for rows in result.partitions():
+            for row in rows:
+                values = [_export_value(value) for value in row]
+                if export_format == ExportFormat.csv:
+                    writer.writerow(values)
+                else:
+                    buffer.write(json.dumps(dict(zip(EXPORT_COLUMNS, values)), ensure_ascii=False))
+                    buffer.write("\n")
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue()
+
+@router.get("/export")
+async def export_transactions(
+    *,
+    current_user: User = Depends(get_current_user),
+    export_format: ExportFormat = Query(ExportFormat.csv, alias="format"),
+    start_date: date = None,
+    end_date: date = None,
+    category_id: int = None,
+    bank_id: int = None
+):
+    """
+    Download transactions as CSV or NDJSON, newest first. Rows are streamed
+    from a server-side cursor, so memory use does not grow with history size.
+    """
+    query = select(*(getattr(Transaction, column) for column in EXPORT_COLUMNS))
+    query = _filter_transactions(
+        query, current_user.id, start_date, end_date, category_id, bank_id
+    ).order_by(Transaction.date.desc(), Transaction.id.desc())
+
+    media_type = "text/csv" if export_format == ExportFormat.csv else "application/x-ndjson"
+    filename = f"transactions.{export_format.value}"
+    return StreamingResponse(
+        _stream_export(query, export_format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@router.get("/summary/period", response_model=List[PeriodSummary])
+async def get_period_summary(
+    *,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+    interval: SummaryInterval = SummaryInterval.month,
+    start_date: date = None,
+    end_date: date = None,
+    category_id: int = None,
+    bank_id: int = None
+):
+    """
+    Income, expense and net totals per day, week (starting Monday) or month
+    """
+    try:
+        use_rollups = interval == SummaryInterval.month and _use_rollups(start_date, end_date)
+        if use_rollups:
+            period = TransactionRollup.month.label("period")
+        else:
+            period = period_start(interval.value, Transaction.date).label("period")
+
+        query = _summary_query([period], use_rollups).order_by(period)
+        query = _filter_transactions(
+            query, current_user.id, start_date, end_date, category_id, bank_id, use_rollups
+        )
+        rows = (await session.exec(query)).all()
+        return [{"period": row.period, **_summary_totals(row)} for row in rows]
+    except Exception as e:
+        logger.error(f"Error summarizing transactions: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error summarizing transactions: {str(e)}"
+        )
+
+@router.get("/summary/categories", response_model=List[CategorySummary])
+async def get_category_summary(
+    *,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+    start_date: date = None,
+    end_date: date = None,
+    bank_id: int = None
+):
+    """
+    Income, expense and net totals per category
+    """
+    try:
+        use_rollups = _use_rollups(start_date, end_date)
+        query = _summary_query(
+            [Category.id, Category.name, Category.is_income], use_rollups
+        ).order_by(Category.name)
+        query = _filter_transactions(
+            query, current_user.id, start_date, end_date, None, bank_id, use_rollups
+        )
+        rows = (await session.exec(query)).all()
+        return [
+            {
+                "category_id": row.id,
+                "category_name": row.name,
+                "is_income": row.is_income,
+                **_summary_totals(row)
+            }
+            for row in rows
+        ]
+    except Exception as e:
+        logger.error(f"Error summarizing transactions: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error summarizing transactions: {str(e)}"
+        )
+
+@router.get("/summary/banks", response_model=List[BankSummary])
+async def get_bank_summary(
+    *,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+    start_date: date = None,
+    end_date: date = None,
+    category_id: int = None
+):
+    """
+    Income, expense and net totals per bank
+    """
+    try:
+        use_rollups = _use_rollups(start_date, end_date)
+        source = TransactionRollup if use_rollups else Transaction
+        query = (
+            _summary_query([Bank.id, Bank.name], use_rollups)
+            .join(Bank, Bank.id == source.bank_id)
+            .order_by(Bank.name)
+        )
+        query = _filter_transactions(
+            query, current_user.id, start_date, end_date, category_id, None, use_rollups
+        )
+        rows = (await session.exec(query)).all()
+        return [
+            {"bank_id": row.id, "bank_name": row.name, **_summary_totals(row)}
+            for row in rows
+        ]
+    except Exception as e:
+        logger.error(f"Error summarizing transactions: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error summarizing transactions: {str(e)}"
+        )
+
 @router.get("/{transaction_id}", response_model=TransactionRead)
 async def get_transaction(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     transaction_id: int,
     current_user: User = Depends(get_current_user)
 ):
     try:
-        transaction = session.get(Transaction, transaction_id)
+        transaction = await session.get(Transaction, transaction_id)
         if not transaction:
             raise HTTPException(status_code=404, detail="Transaction not found")
         
@@ -132,47 +655,52 @@ async def get_transaction(
 @router.patch("/{transaction_id}", response_model=TransactionRead)
 async def update_transaction(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     transaction_id: int,
     transaction_update: TransactionUpdate,
     current_user: User = Depends(get_current_user)
 ):
     try:
-        transaction = session.get(Transaction, transaction_id)
-        if not transaction:
-            raise HTTPException(status_code=404, detail="Transaction not found")
+        transaction = await _get_transaction_for_write(session, transaction_id, current_user.id)
 
         update_data = transaction_update.dict(exclude_unset=True)
 
-        # If updating amount or bank, adjust bank balances
-        if "amount" in update_data or "bank_id" in update_data:
-            old_bank = session.get(Bank, transaction.bank_id)
+        # If updating amount, bank or category, adjust bank balances
+        if {"amount", "bank_id", "category_id"} & update_data.keys():
+            old_bank = transaction.bank
             new_bank = old_bank
+            old_category = transaction.category
+            new_category = old_category
 
-            if "bank_id" in update_data:
-                new_bank = session.get(Bank, update_data["bank_id"])
-                if not new_bank:
+            if "bank_id" in update_data and update_data["bank_id"] != old_bank.id:
+                new_bank = await session.get(Bank, update_data["bank_id"])
+                if not new_bank or new_bank.user_id != current_user.id:
                     raise HTTPException(status_code=404, detail="New bank not found")
 
-            # Reverse old transaction
-            if transaction.category.is_income:
-                old_bank.end_balance -= transaction.amount
-            else:
-                old_bank.end_balance += transaction.amount
+            # Kategori baru bisa mengubah income <-> expense
+            if "category_id" in update_data and update_data["category_id"] != old_category.id:
+                new_category = await session.get(Category, update_data["category_id"])
+                if not new_category or new_category.user_id != current_user.id:
+                    raise HTTPException(status_code=404, detail="New category not found")
 
-            # Apply new transaction
+            # Reverse old transaction, then apply the new one
+            bank_deltas = defaultdict(int)
+            bank_deltas[old_bank.id] -= transaction.amount if old_category.is_income else -transaction.amount
             new_amount = update_data.get("amount", transaction.amount)
-            if transaction.category.is_income:
-                new_bank.end_balance += new_amount
-            else:
-                new_bank.end_balance -= new_amount
+            bank_deltas[new_bank.id] += new_amount if new_category.is_income else -new_amount
+            await apply_balance_deltas(session, bank_deltas)
 
-            old_bank.updated_at = get_utc_now()
-            new_bank.updated_at = get_utc_now()
+        old_bank_id = transaction.bank_id
+        if "date" in update_data and update_data["date"] != transaction.date:
+            # Saldo tetap, tapi balance history berubah; updated_at bank jadi key cache-nya
+            await touch_banks(session, old_bank_id, update_data.get("bank_id", old_bank_id))
 
-            session.add(old_bank)
-            if new_bank != old_bank:
-                session.add(new_bank)
+        # Pindahkan transaksi dari bucket rollup lama ke yang baru
+        rollup_deltas = {}
+        add_rollup_delta(
+            rollup_deltas, transaction.user_id, transaction.bank_id,
+            transaction.category_id, transaction.date, -transaction.amount, -1
+        )
 
         # Update transaction fields
         for field, value in update_data.items():
@@ -180,9 +708,16 @@ async def update_transaction(
 
         transaction.updated_at = get_utc_now()
 
+        add_rollup_delta(
+            rollup_deltas, transaction.user_id, transaction.bank_id,
+            transaction.category_id, transaction.date, transaction.amount, 1
+        )
+        await apply_rollup_deltas(session, rollup_deltas)
+        await touch_transactions(session, current_user.id)
+
         session.add(transaction)
-        session.commit()
-        session.refresh(transaction)
+        await session.commit()
+        await session.refresh(transaction)
         
         logger.info(f"Transaction updated successfully: {transaction.id}")
         return transaction
@@ -198,27 +733,27 @@ async def update_transaction(
 @router.delete("/{transaction_id}")
 async def delete_transaction(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     transaction_id: int,
     current_user: User = Depends(get_current_user)
 ):
     try:
-        transaction = session.get(Transaction, transaction_id)
-        if not transaction:
-            raise HTTPException(status_code=404, detail="Transaction not found")
+        transaction = await _get_transaction_for_write(session, transaction_id, current_user.id)
 
         # Adjust bank balance
-        bank = session.get(Bank, transaction.bank_id)
-        if transaction.category.is_income:
-            bank.end_balance -= transaction.amount
-        else:
-            bank.end_balance += transaction.amount
+        delta = -transaction.amount if transaction.category.is_income else transaction.amount
+        await apply_balance_deltas(session, {transaction.bank_id: delta})
 
-        bank.updated_at = get_utc_now()
+        rollup_deltas = {}
+        add_rollup_delta(
+            rollup_deltas, transaction.user_id, transaction.bank_id,
+            transaction.category_id, transaction.date, -transaction.amount, -1
+        )
+        await apply_rollup_deltas(session, rollup_deltas)
+        await touch_transactions(session, current_user.id)
 
-        session.delete(transaction)
-        session.add(bank)
-        session.commit()
+        await session.delete(transaction)
+        await session.commit()
         
         logger.info(f"Transaction deleted successfully: {transaction_id}")
         return {"message": "Transaction deleted successfully"}
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List
-from app.db.session import get_session
+from app.db.session import get_async_session
 from app.models.user import User, UserCreate, UserRead, UserUpdate
-from app.api.deps import get_current_user
-from app.core.security import get_password_hash
-from app.core.utils import get_utc_now
+from app.api.deps import get_current_user, invalidate_cached_user
+from app.core.security import get_password_hash_async, PasswordHashingBusyError
+from app.core.utils import get_utc_now, set_current_timezone
 import logging
 
 router = APIRouter()
@@ -15,15 +17,15 @@ logger = logging.getLogger(__name__)
 async def get_users(
     skip: int = 0,
     limit: int = 100,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
 ):
     try:
-        users = session.exec(
+        users = (await session.exec(
             select(User)
             .offset(skip)
             .limit(limit)
-        ).all()
+        )).all()
         return users
     except Exception as e:
         logger.error(f"Error retrieving users: {e}")
@@ -39,7 +41,7 @@ async def get_current_user_info(current_user: User = Depends(get_current_user)):
 @router.patch("/me", response_model=UserRead)
 async def update_user_me(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     user_update: UserUpdate,
     current_user: User = Depends(get_current_user)
 ):
@@ -47,11 +49,11 @@ async def update_user_me(
         update_data = user_update.dict(exclude_unset=True)
 
         if "username" in update_data:
-            existing_user = session.exec(
+            existing_user = (await session.exec(
                 select(User)
                 .where(User.username == update_data["username"])
                 .where(User.id != current_user.id)
-            ).first()
+            )).first()
             if existing_user:
                 raise HTTPException(
                     status_code=400,
@@ -59,11 +61,11 @@ async def update_user_me(
                 )
 
         if "email" in update_data:
-            existing_user = session.exec(
+            existing_user = (await session.exec(
                 select(User)
                 .where(User.email == update_data["email"])
                 .where(User.id != current_user.id)
-            ).first()
+            )).first()
             if existing_user:
                 raise HTTPException(
                     status_code=400,
@@ -71,7 +73,7 @@ async def update_user_me(
                 )
 
         if "password" in update_data:
-            update_data["password"] = get_password_hash(update_data["password"])
+            update_data["password"] = await get_password_hash_async(update_data["password"])
 
         for field, value in update_data.items():
             setattr(current_user, field, value)
@@ -79,13 +81,34 @@ async def update_user_me(
         current_user.updated_at = get_utc_now()
 
         session.add(current_user)
-        session.commit()
-        session.refresh(current_user)
+
+        # Token yang sudah terbit tidak berlaku lagi setelah ganti password / nonaktif.
+        # Dinaikkan di SQL: current_user bisa berasal dari snapshot cache yang sudah basi
+        if "password" in update_data or update_data.get("is_active") is False:
+            await session.exec(
+                update(User)
+                .where(User.id == current_user.id)
+                .values(token_version=User.token_version + 1)
+                .execution_options(synchronize_session=False)
+            )
+
+        await session.commit()
+        await session.refresh(current_user)
+        invalidate_cached_user(current_user.id)
+
+        if "timezone" in update_data:
+            set_current_timezone(current_user.timezone)
         
         return current_user
 
     except HTTPException:
         raise
+    except PasswordHashingBusyError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please try again",
+            headers={"Retry-After": "1"}
+        )
     except Exception as e:
         logger.error(f"Error updating user: {e}")
         raise HTTPException(
@@ -96,11 +119,11 @@ async def update_user_me(
 @router.get("/{user_id}", response_model=UserRead)
 async def get_user(
     user_id: int,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
 ):
     try:
-        user = session.get(User, user_id)
+        user = await session.get(User, user_id)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         return user
@@ -6,7 +6,50 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
-    TIMEZONE: int = 7  # Tambahkan ini
+    # Timezone default untuk user yang belum memilih: nama IANA atau offset jam dari UTC
+    TIMEZONE: str = "Asia/Jakarta"
+
+    # "database" mencari user di DB setiap request, "stateless" memakai
+    # claim di token plus cache user in-process (per worker, basi maksimal TTL)
+    AUTH_MODE: str = "database"
+    USER_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_MAX_SIZE: int = 10000
+
+    # Password hashing
+    BCRYPT_ROUNDS: int = 12  # Cost factor, setiap +1 menggandakan waktu hash
+    PASSWORD_HASH_WORKERS: int = 4  # Thread bcrypt yang berjalan bersamaan
+    PASSWORD_HASH_MAX_QUEUE: int = 64  # Lebih dari ini request ditolak dengan 503
+
+    # Import mutasi rekening (CSV/OFX)
+    IMPORT_BATCH_SIZE: int = 500
+    IMPORT_MAX_ERRORS: int = 100  # Jumlah error per baris yang dikembalikan
+
+    # Cache balance history per (bank, rentang tanggal)
+    BALANCE_HISTORY_CACHE_TTL_SECONDS: int = 300
+    BALANCE_HISTORY_CACHE_MAX_SIZE: int = 1000
+    BALANCE_HISTORY_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # Perkiraan ukuran semua entri
+    BALANCE_HISTORY_MAX_DAYS: int = 3660
+
+    # Cache daftar bank/kategori per user; "redis" untuk berbagi cache antar worker
+    CACHE_BACKEND: str = "memory"
+    CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    LIST_CACHE_TTL_SECONDS: int = 60
+    LIST_CACHE_MAX_SIZE: int = 10000  # Hanya untuk backend memory
+
+    # Connection pool
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800  # detik, -1 untuk menonaktifkan
+    DB_POOL_PRE_PING: bool = True
+    DB_ECHO: bool = False  # Log semua SQL query (lambat, hanya untuk debugging)
+
+    # Instrumentasi request: header Server-Timing dan log query lambat (0 = nonaktif)
+    SERVER_TIMING_HEADER: bool = True
+    SLOW_QUERY_MS: int = 200
+    # Endpoint /metrics tanpa autentikasi untuk Prometheus; aktifkan hanya jika /metrics
+    # tidak bisa dijangkau dari luar (mis. diblokir di reverse proxy)
+    PROMETHEUS_METRICS: bool = False
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,21 @@
+# app/core/pagination.py
+import base64
+from datetime import date
+from typing import Tuple
+
+# Header response yang berisi cursor untuk halaman berikutnya
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(row_date: date, row_id: int) -> str:
+    """Opaque keyset cursor pointing just after the (date, id) row"""
+    raw = f"{row_date.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[date, int]:
+    """Inverse of encode_cursor, raises ValueError for malformed cursors"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw_date, raw_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return date.fromisoformat(raw_date), int(raw_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
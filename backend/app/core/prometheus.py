@@ -0,0 +1,115 @@
+# app/core/prometheus.py
+"""
+Request metrics in the Prometheus text format, without a client library.
+
+Counters and histograms here are plain ints and floats without locks: they
+are only updated by RequestTimingMiddleware on the event loop thread, and
+the /metrics handler renders them on the same thread without awaiting in
+between, so a scrape always reads a consistent snapshot and never blocks
+a request. Every worker process exposes its own numbers.
+"""
+from bisect import bisect_left
+from typing import Dict, Iterable, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Detik, sama dengan default client Prometheus
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum")
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Terakhir untuk +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        # le inklusif: nilai yang sama dengan batas masuk bucket itu
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+class RequestMetrics:
+    def __init__(self):
+        self.requests: Dict[Tuple[str, str, str], int] = {}  # (router, method, status)
+        self.durations: Dict[str, Histogram] = {}
+        self.db_statements: Dict[str, int] = {}
+        self.db_seconds: Dict[str, float] = {}
+
+    def observe(self, router: str, method: str, status: int, seconds: float, statements: int, db_seconds: float):
+        key = (router, method, str(status))
+        self.requests[key] = self.requests.get(key, 0) + 1
+        histogram = self.durations.get(router)
+        if histogram is None:
+            histogram = self.durations[router] = Histogram()
+        histogram.observe(seconds)
+        self.db_statements[router] = self.db_statements.get(router, 0) + statements
+        self.db_seconds[router] = self.db_seconds.get(router, 0.0) + db_seconds
+
+request_metrics = RequestMetrics()
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class MetricWriter:
+    """Collects metric families and renders the exposition text"""
+
+    def __init__(self):
+        self._lines = []
+
+    def family(self, name: str, kind: str, help_text: str, samples: Iterable[Tuple[Dict[str, str], float]]):
+        self._lines.append(f"# HELP {name} {help_text}")
+        self._lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            self._lines.append(f"{name}{_labels(labels)} {_number(value)}")
+
+    def histograms(self, name: str, help_text: str, label: str, histograms: Dict[str, Histogram]):
+        self._lines.append(f"# HELP {name} {help_text}")
+        self._lines.append(f"# TYPE {name} histogram")
+        for value, histogram in sorted(histograms.items()):
+            cumulative = 0
+            for bound, count in zip((*histogram.buckets, float("inf")), histogram.counts):
+                cumulative += count
+                self._lines.append(f"{name}_bucket{_labels({label: value, 'le': _number(float(bound))})} {cumulative}")
+            self._lines.append(f"{name}_sum{_labels({label: value})} {_number(histogram.sum)}")
+            self._lines.append(f"{name}_count{_labels({label: value})} {cumulative}")
+
+    def summary(self, name: str, help_text: str, total: float, count: int):
+        self._lines.append(f"# HELP {name} {help_text}")
+        self._lines.append(f"# TYPE {name} summary")
+        self._lines.append(f"{name}_sum {_number(float(total))}")
+        self._lines.append(f"{name}_count {count}")
+
+    def render(self) -> str:
+        return "\n".join(self._lines) + "\n"
+
+def write_request_metrics(writer: MetricWriter, metrics: RequestMetrics = request_metrics):
+    writer.family(
+        "floo_http_requests_total", "counter", "HTTP requests by router, method and status",
+        (
+            ({"router": router, "method": method, "status": status}, count)
+            for (router, method, status), count in sorted(metrics.requests.items())
+        )
+    )
+    writer.histograms(
+        "floo_http_request_duration_seconds", "HTTP request latency by router",
+        "router", metrics.durations
+    )
+    writer.family(
+        "floo_db_statements_total", "counter", "SQL statements executed while handling requests",
+        (({"router": router}, count) for router, count in sorted(metrics.db_statements.items()))
+    )
+    writer.family(
+        "floo_db_seconds_total", "counter", "Time spent in SQL statements while handling requests",
+        (({"router": router}, seconds) for router, seconds in sorted(metrics.db_seconds.items()))
+    )
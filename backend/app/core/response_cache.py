@@ -0,0 +1,69 @@
+# app/core/response_cache.py
+"""
+Per-user cache of serialized list responses (banks, categories).
+Entries are keyed by the response's ETag, which is computed from the
+database on every request (app/api/conditional.py), so any write, from any
+worker or process, makes the old entries unreachable without invalidation.
+"""
+import logging
+from typing import Optional
+from app.core.cache import CacheBackend, create_cache_backend
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CACHE_STATUS_HEADER = "X-Cache"
+
+_backend: Optional[CacheBackend] = None
+
+def get_cache_backend() -> CacheBackend:
+    global _backend
+    if _backend is None:
+        _backend = create_cache_backend(
+            settings.CACHE_BACKEND,
+            settings.CACHE_REDIS_URL,
+            max_size=settings.LIST_CACHE_MAX_SIZE,
+            ttl=settings.LIST_CACHE_TTL_SECONDS
+        )
+    return _backend
+
+def set_cache_backend(backend: CacheBackend):
+    """Swap the backend, e.g. for a local Redis stand-in"""
+    global _backend
+    _backend = backend
+
+
+class ListCache:
+    def __init__(self, namespace: str, ttl: int):
+        self.namespace = namespace
+        self.ttl = ttl
+        # Hanya diubah di event loop, untuk metrics hit ratio
+        self.hits = 0
+        self.misses = 0
+
+    def _entry_key(self, user_id: int, etag: str) -> str:
+        # ETag sudah mencakup query string dan timezone user
+        return f"floo:{self.namespace}:{user_id}:" + etag.strip('"')
+
+    async def lookup(self, user_id: int, etag: str) -> Optional[bytes]:
+        try:
+            body = await get_cache_backend().get(self._entry_key(user_id, etag))
+        except Exception as e:
+            logger.warning(f"Cache lookup failed for {self.namespace}: {e}")
+            body = None
+        if body is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return body
+
+    async def store(self, user_id: int, etag: str, body: bytes):
+        try:
+            await get_cache_backend().set(self._entry_key(user_id, etag), body, ttl=self.ttl)
+        except Exception as e:
+            logger.warning(f"Cache store failed for {self.namespace}: {e}")
+
+
+# end_balance berubah lewat apply_balance_deltas, yang juga menggeser updated_at bank
+bank_list_cache = ListCache("banks", settings.LIST_CACHE_TTL_SECONDS)
+category_list_cache = ListCache("categories", settings.LIST_CACHE_TTL_SECONDS)
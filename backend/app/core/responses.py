@@ -0,0 +1,89 @@
+# app/core/responses.py
+"""
+orjson response class with the TimestampResponseMixin local-time conversion
+built into the serializer, plus a helper that turns ORM rows into plain
+dicts so large lists skip the validate-then-encode pass of response_model.
+"""
+from datetime import date, datetime, time
+from functools import lru_cache
+from typing import Any, Iterable, List, Optional, Tuple, Type, get_args
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from app.core.utils import to_local_time
+
+def _default(value: Any):
+    if isinstance(value, datetime):
+        return to_local_time(value).isoformat()
+    # OPT_PASSTHROUGH_DATETIME juga melewatkan date dan time ke sini
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+class LocalTimeJSONResponse(JSONResponse):
+    """
+    Same output as the default JSONResponse + json_encoders, rendered by
+    orjson. Datetimes are converted with to_local_time like
+    TimestampResponseMixin does.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=_default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        )
+
+@lru_cache(maxsize=None)
+def _field_plan(model: Type[BaseModel]) -> Tuple[Tuple[str, Optional[type]], ...]:
+    """(field name, nested model or None) in the model's serialization order"""
+    plan = []
+    for name, field in model.model_fields.items():
+        nested = None
+        for candidate in (field.annotation, *get_args(field.annotation)):
+            if isinstance(candidate, type) and issubclass(candidate, BaseModel):
+                nested = candidate
+        plan.append((name, nested))
+    return tuple(plan)
+
+def _local_isoformat(value: datetime, seen: dict) -> str:
+    # created_at/updated_at sering sama persis antar baris (mis. hasil bulk insert)
+    if value.tzinfo is not None:
+        return to_local_time(value).isoformat()
+    text = seen.get(value)
+    if text is None:
+        text = seen[value] = to_local_time(value).isoformat()
+    return text
+
+def _row_dict(obj: Any, model: Type[BaseModel], exclude_none: bool, seen: dict) -> dict:
+    # Kolom dan relasi yang sudah di-load ada di __dict__ objek ORM, lebih murah dari getattr
+    values = obj.__dict__ if hasattr(obj, "_sa_instance_state") else None
+    data = {}
+    for name, nested in _field_plan(model):
+        value = values.get(name) if values is not None else getattr(obj, name, None)
+        if value is not None and nested is not None:
+            # Bank/kategori yang sama muncul di banyak baris, cukup dibuat sekali.
+            # Divalidasi supaya validator model (mis. end_balance di BankBase) ikut
+            # berjalan dan hasilnya sama dengan endpoint bank/kategori sendiri
+            key = (id(value), nested)
+            if key not in seen:
+                seen[key] = _row_dict(nested.model_validate(value), nested, exclude_none, seen)
+            value = seen[key]
+        elif isinstance(value, datetime):
+            value = _local_isoformat(value, seen)
+        if value is None and exclude_none:
+            continue
+        data[name] = value
+    return data
+
+def model_rows(rows: Iterable[Any], model: Type[BaseModel], exclude_none: bool = False) -> List[dict]:
+    """
+    Read the fields of `model` straight from already-loaded ORM objects,
+    with datetimes already converted to local-time strings. Top-level rows
+    are not validated, so only use it for rows that came from the database;
+    nested models are validated once per distinct object.
+    """
+    seen = {}
+    return [_row_dict(row, model, exclude_none, seen) for row in rows]
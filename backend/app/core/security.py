@@ -1,4 +1,8 @@
 # app/core/security.py
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional, Union, Dict, Any
 from jose import JWTError, jwt
@@ -8,7 +12,94 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
+
+class PasswordHashingBusyError(Exception):
+    """Raised when the password hashing queue is full"""
+
+class PasswordHashingStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+
+    def try_enqueue(self, limit: int) -> bool:
+        with self._lock:
+            if self.queued >= limit:
+                self.rejected += 1
+                return False
+            self.queued += 1
+            return True
+
+    def dequeue(self):
+        with self._lock:
+            self.queued -= 1
+
+    def start(self, waited: float):
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+            self.queue_wait_total += waited
+            self.queue_wait_max = max(self.queue_wait_max, waited)
+
+    def finish(self):
+        with self._lock:
+            self.running -= 1
+            self.completed += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            started = self.completed + self.running
+            average = self.queue_wait_total / started if started else 0.0
+            return {
+                "workers": settings.PASSWORD_HASH_WORKERS,
+                "max_queue": settings.PASSWORD_HASH_MAX_QUEUE,
+                "bcrypt_rounds": settings.BCRYPT_ROUNDS,
+                "queue_depth": self.queued,
+                "running": self.running,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "queue_wait_avg_ms": round(average * 1000, 3),
+                "queue_wait_max_ms": round(self.queue_wait_max * 1000, 3),
+                "queue_wait_total_ms": round(self.queue_wait_total * 1000, 3),
+            }
+
+# bcrypt melepas GIL, jadi thread cukup untuk menjalankannya paralel
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="bcrypt"
+)
+hashing_stats = PasswordHashingStats()
+
+async def _run_in_hash_pool(func, *args):
+    if not hashing_stats.try_enqueue(settings.PASSWORD_HASH_MAX_QUEUE):
+        raise PasswordHashingBusyError("Too many concurrent password operations")
+
+    submitted_at = time.perf_counter()
+
+    def job():
+        hashing_stats.start(time.perf_counter() - submitted_at)
+        try:
+            return func(*args)
+        finally:
+            hashing_stats.finish()
+
+    future = _hash_executor.submit(job)
+    try:
+        return await asyncio.wrap_future(future)
+    except asyncio.CancelledError:
+        # Job yang belum mulai tidak perlu dijalankan lagi
+        if future.cancel():
+            hashing_stats.dequeue()
+        raise
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     try:
@@ -24,6 +115,14 @@ def get_password_hash(password: str) -> str:
         logger.error(f"Password hashing error: {str(e)}", exc_info=True)
         raise Exception("Error hashing password")
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the bounded hashing pool, keeps the event loop free"""
+    return await _run_in_hash_pool(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash on the bounded hashing pool, keeps the event loop free"""
+    return await _run_in_hash_pool(get_password_hash, password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     try:
         to_encode = data.copy()
@@ -40,6 +139,14 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         logger.error(f"Token creation error: {str(e)}", exc_info=True)
         raise Exception("Error creating access token")
 
+def get_token_claims(user) -> Dict[str, Any]:
+    """Claims needed to authenticate a request without loading the user"""
+    return {
+        "sub": str(user.id),
+        "act": user.is_active,
+        "ver": user.token_version
+    }
+
 def decode_token(token: str) -> Optional[Dict[str, Any]]:
     try:
         payload = jwt.decode(
@@ -0,0 +1,157 @@
+# app/core/statements.py
+"""
+Row-by-row parsers for bank statement exports (CSV and OFX)
+"""
+import csv
+import re
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Iterator, Optional, TextIO, Union
+
+CSV_DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%Y/%m/%d")
+
+@dataclass
+class StatementRow:
+    line: int
+    date: date
+    amount: int  # Negatif untuk uang keluar
+    description: str
+    category: Optional[str] = None
+
+@dataclass
+class StatementRowError:
+    line: int
+    error: str
+
+ParsedRow = Union[StatementRow, StatementRowError]
+
+_AMOUNT_MARKER = re.compile(r"(?<=[\d\s])(DB|DR|CR)\.?$", re.IGNORECASE)
+_AMOUNT_NUMBER = re.compile(r"(?P<prefix>[^\d]*?)(?P<number>\d[\d.,]*)(?P<suffix>[^\d]*)")
+
+def parse_amount(raw: str) -> int:
+    """
+    Parse a statement amount into whole units: '1.250.000', '-1,250,000.00',
+    '(15000)', 'Rp -15.000', '15.000-', 'Rp 10.000,-', '15.000 DB' or '15.000 CR'.
+    A fractional part must be zero, amounts are stored as integers.
+    """
+    value = raw.strip()
+    debit = False
+    if value.startswith("(") and value.endswith(")"):
+        debit, value = True, value[1:-1].strip()
+
+    credit = False
+    marker = _AMOUNT_MARKER.search(value)
+    if marker:
+        if marker.group(1).upper() == "CR":
+            credit = True
+        else:
+            debit = True
+        value = value[:marker.start()]
+
+    # ',-' / '.-' di belakang angka berarti tanpa sen (mis. 'Rp 10.000,-'), bukan minus
+    value = re.sub(r"(?<=\d)[.,]-$", "", value.strip())
+
+    match = _AMOUNT_NUMBER.fullmatch(value)
+    if not match:
+        raise ValueError(f"Invalid amount: {raw!r}")
+    # Tanda minus bisa sebelum angka (setelah 'Rp') atau di belakang angka
+    prefix, suffix = match.group("prefix"), match.group("suffix").strip()
+    if re.search(r"[^A-Za-z$€£¥\s.+-]", prefix) or (suffix not in ("", "-") and not suffix.isalpha()):
+        raise ValueError(f"Invalid amount: {raw!r}")
+    if suffix == "-" and not match.group("number")[-1].isdigit():
+        raise ValueError(f"Invalid amount: {raw!r}")
+    debit = debit or "-" in prefix or suffix == "-"
+    if debit and credit:
+        raise ValueError(f"Conflicting signs in amount: {raw!r}")
+
+    # Pemisah terakhir diikuti 1-2 digit dianggap desimal, sisanya pemisah ribuan
+    number = match.group("number")
+    fraction = re.match(r"^(.*?)[.,](\d{1,2})$", number)
+    if fraction:
+        number = fraction.group(1)
+        if int(fraction.group(2)):
+            raise ValueError(f"Fractional amounts are not supported: {raw!r}")
+    digits = re.sub(r"[.,]", "", number) or "0"
+    return -int(digits) if debit else int(digits)
+
+def parse_date(raw: str) -> date:
+    value = raw.strip()
+    for fmt in CSV_DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid date: {raw!r}")
+
+def parse_csv(stream: TextIO) -> Iterator[ParsedRow]:
+    """
+    Parse a CSV with a header row containing date, amount, description and
+    optionally category (case-insensitive). Yields one result per data row.
+    """
+    reader = csv.reader(stream)
+    header = next(reader, None)
+    if header is None:
+        return
+    columns = {name.strip().lower(): index for index, name in enumerate(header)}
+    missing = {"date", "amount", "description"} - columns.keys()
+    if missing:
+        yield StatementRowError(1, f"Missing columns: {', '.join(sorted(missing))}")
+        return
+
+    category_index = columns.get("category")
+    for values in reader:
+        line = reader.line_num
+        if not any(value.strip() for value in values):
+            continue
+        try:
+            category = None
+            if category_index is not None and category_index < len(values):
+                category = values[category_index].strip() or None
+            yield StatementRow(
+                line=line,
+                date=parse_date(values[columns["date"]]),
+                amount=parse_amount(values[columns["amount"]]),
+                description=values[columns["description"]].strip(),
+                category=category
+            )
+        except (ValueError, IndexError) as e:
+            yield StatementRowError(line, str(e) or "Malformed row")
+
+_OFX_TAG = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<\r\n]*)")
+
+def parse_ofx(stream: TextIO) -> Iterator[ParsedRow]:
+    """
+    Parse STMTTRN entries from an OFX 1.x (SGML) or 2.x (XML) statement.
+    The stream is read line by line; OFX has no category, so only date,
+    signed amount and NAME/MEMO description are filled in.
+    """
+    current = None
+    start_line = 0
+    for line_number, text in enumerate(stream, start=1):
+        for closing, tag, value in _OFX_TAG.findall(text):
+            tag = tag.upper()
+            if tag == "STMTTRN":
+                if closing and current is not None:
+                    yield _ofx_row(start_line, current)
+                    current = None
+                elif not closing:
+                    current, start_line = {}, line_number
+            elif current is not None and not closing and value.strip():
+                current[tag] = value.strip()
+
+def _ofx_row(line: int, fields: dict) -> ParsedRow:
+    try:
+        description = fields.get("NAME") or fields.get("MEMO") or ""
+        if fields.get("NAME") and fields.get("MEMO"):
+            description = f"{fields['NAME']} - {fields['MEMO']}"
+        return StatementRow(
+            line=line,
+            # DTPOSTED: YYYYMMDD[HHMMSS[.XXX][TZ]]
+            date=datetime.strptime(fields["DTPOSTED"][:8], "%Y%m%d").date(),
+            amount=parse_amount(fields["TRNAMT"]),
+            description=description
+        )
+    except KeyError as e:
+        return StatementRowError(line, f"Missing field: {e.args[0]}")
+    except ValueError as e:
+        return StatementRowError(line, str(e))
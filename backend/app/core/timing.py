@@ -0,0 +1,156 @@
+# app/core/timing.py
+"""
+Per-request timing: wall time, SQL statement count, DB time and rows,
+collected per route and sent back in a Server-Timing header. The SQL side
+is recorded by the engine hooks in app/db/query_events.py.
+"""
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+from app.core.config import settings
+from app.core.prometheus import request_metrics
+
+class RequestStats:
+    """SQL work done while handling one request"""
+    __slots__ = ("statements", "db_time", "rows")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_time = 0.0
+        self.rows = 0
+
+# Di-set oleh middleware; query di luar request (CLI, startup) tidak tercatat
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _request_stats.get()
+
+class RouteTotals:
+    __slots__ = ("requests", "errors", "wall_total", "wall_max", "statements", "db_time", "rows")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.wall_total = 0.0
+        self.wall_max = 0.0
+        self.statements = 0
+        self.db_time = 0.0
+        self.rows = 0
+
+class RouteStats:
+    """Running totals per "METHOD /path/{template}" """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[str, RouteTotals] = {}
+
+    def record(self, route: str, status: int, wall: float, stats: RequestStats):
+        with self._lock:
+            totals = self._routes.get(route)
+            if totals is None:
+                totals = self._routes[route] = RouteTotals()
+            totals.requests += 1
+            if status >= 500:
+                totals.errors += 1
+            totals.wall_total += wall
+            totals.wall_max = max(totals.wall_max, wall)
+            totals.statements += stats.statements
+            totals.db_time += stats.db_time
+            totals.rows += stats.rows
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                route: {
+                    "requests": totals.requests,
+                    "errors": totals.errors,
+                    "wall_avg_ms": round(totals.wall_total / totals.requests * 1000, 3),
+                    "wall_max_ms": round(totals.wall_max * 1000, 3),
+                    "statements_avg": round(totals.statements / totals.requests, 2),
+                    "db_avg_ms": round(totals.db_time / totals.requests * 1000, 3),
+                    "rows_avg": round(totals.rows / totals.requests, 2),
+                    "statements_total": totals.statements,
+                    "db_total_ms": round(totals.db_time * 1000, 3),
+                    "rows_total": totals.rows,
+                }
+                for route, totals in sorted(self._routes.items())
+            }
+
+route_stats = RouteStats()
+
+def route_name(scope: dict) -> str:
+    """Method plus path template, so /banks/1 and /banks/2 share one entry"""
+    template = getattr(scope.get("route"), "path", None)
+    if template is None:
+        return f"{scope['method']} unmatched"
+    # Path route bisa relatif terhadap prefix router; prefix diambil dari path asli
+    prefix = scope["path"].rsplit("/", template.count("/"))[0]
+    return f"{scope['method']} {prefix}{template}"
+
+# id(route) -> nama router untuk label Prometheus, diisi oleh label_router di main.py
+_router_labels: Dict[int, str] = {}
+
+def label_router(router, label: str):
+    for route in router.routes:
+        _router_labels[id(route)] = label
+
+def router_label(scope: dict) -> str:
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    label = _router_labels.get(id(route))
+    if label is None:
+        # FastAPI versi lain menyalin route saat include_router, tags-nya ikut tersalin
+        tags = getattr(route, "tags", None)
+        label = tags[0] if tags else "other"
+    return label
+
+def server_timing(wall: float, stats: RequestStats) -> str:
+    return (
+        f'app;dur={wall * 1000:.2f}, '
+        f'db;dur={stats.db_time * 1000:.2f};desc="{stats.statements} queries, {stats.rows} rows"'
+    )
+
+class RequestTimingMiddleware:
+    """
+    Pure ASGI middleware: no extra task per request and streaming responses
+    pass through untouched. The header carries the time until the response
+    starts; the route totals use the time until the body is sent.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if settings.SERVER_TIMING_HEADER:
+                    header = server_timing(time.perf_counter() - started, stats)
+                    message["headers"] = [*message.get("headers", []), (b"server-timing", header.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            wall = time.perf_counter() - started
+            route_stats.record(route_name(scope), status, wall, stats)
+            request_metrics.observe(
+                router_label(scope), scope["method"], status, wall, stats.statements, stats.db_time
+            )
+            _request_stats.reset(token)
@@ -1,13 +1,49 @@
 # app/core/utils.py
-from datetime import datetime, timezone, timedelta
+import math
+from contextvars import ContextVar
+from datetime import date, datetime, timezone, timedelta, tzinfo
+from functools import lru_cache
+from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from app.core.config import settings
 
 
 def get_utc_now() -> datetime:
     """Get current UTC time"""
     return datetime.now(timezone.utc)
 
+@lru_cache(maxsize=512)
+def get_timezone(name: str) -> tzinfo:
+    """tzinfo for an IANA name ("Asia/Jakarta") or a UTC offset in hours ("7", "-3.5")"""
+    try:
+        hours = float(name)
+    except ValueError:
+        hours = None
+    if hours is not None:
+        # "inf"/"1e300" membuat timedelta overflow, "nan" tidak bisa dibandingkan
+        if not math.isfinite(hours) or abs(hours) >= 24:
+            raise ValueError(f"Unknown timezone: {name}")
+        return timezone(timedelta(hours=hours))
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown timezone: {name}")
+
+# Timezone user yang sedang request, di-set oleh get_current_user
+_current_timezone: ContextVar[Optional[tzinfo]] = ContextVar("current_timezone", default=None)
+
+def set_current_timezone(name: Optional[str]):
+    _current_timezone.set(get_timezone(name or settings.TIMEZONE))
+
+def get_current_timezone() -> tzinfo:
+    return _current_timezone.get() or get_timezone(settings.TIMEZONE)
+
 def to_local_time(dt: datetime) -> datetime:
-    """Convert UTC time to UTC+7"""
+    """Convert a UTC time to the current user's timezone (default: settings.TIMEZONE)"""
     if dt.tzinfo is None:
         dt = dt.replace(tzinfo=timezone.utc)
-    return dt + timedelta(hours=7)  # Hardcode ke UTC+7
\ No newline at end of file
+    return dt.astimezone(get_current_timezone())
+
+def local_today() -> date:
+    """Today's date in the current user's timezone"""
+    return datetime.now(get_current_timezone()).date()
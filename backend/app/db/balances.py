@@ -0,0 +1,253 @@
+"""
+Bank balance queries derived from the transactions table.
+Run `python -m app.db.balances` to reconcile every bank's end_balance.
+"""
+import argparse
+import json
+import logging
+import sys
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy import case, func, update
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.utils import get_utc_now
+from app.models.bank import Bank
+from app.models.category import Category
+from app.models.transaction import Transaction
+
+logger = logging.getLogger(__name__)
+
+def _history_size(history: List[dict]) -> int:
+    """Approximate memory held by a cached balance history, in bytes"""
+    if not history:
+        return sys.getsizeof(history)
+    point = history[0]
+    point_size = sys.getsizeof(point) + sum(sys.getsizeof(value) for value in point.values())
+    return sys.getsizeof(history) + len(history) * point_size
+
+# Satu entri bisa berisi BALANCE_HISTORY_MAX_DAYS titik, jadi dibatasi juga per byte
+balance_history_cache = TTLCache(
+    max_size=settings.BALANCE_HISTORY_CACHE_MAX_SIZE,
+    ttl=settings.BALANCE_HISTORY_CACHE_TTL_SECONDS,
+    max_weight=settings.BALANCE_HISTORY_CACHE_MAX_BYTES,
+    weigh=_history_size
+)
+
+async def apply_balance_deltas(session: AsyncSession, deltas: Dict[int, int]):
+    """
+    Add each delta to end_balance inside the database
+    (end_balance = end_balance + delta), so concurrent writers to the same
+    bank never overwrite each other. The caller owns the commit.
+    """
+    now = get_utc_now()
+    # Urutan bank_id tetap supaya dua request yang menyentuh bank yang sama tidak deadlock
+    for bank_id in sorted(deltas):
+        delta = deltas[bank_id]
+        if not delta:
+            continue
+        await session.exec(
+            update(Bank)
+            .where(Bank.id == bank_id)
+            .values(end_balance=Bank.end_balance + delta, updated_at=now)
+        )
+
+async def touch_banks(session: AsyncSession, *bank_ids: int):
+    """
+    Move updated_at without changing end_balance, for writes that change the
+    balance history but not the balance (a transaction moved to another date)
+    """
+    now = get_utc_now()
+    # Satu UPDATE per bank, urut bank_id seperti apply_balance_deltas (urutan lock tetap)
+    for bank_id in sorted(set(bank_ids)):
+        await session.exec(update(Bank).where(Bank.id == bank_id).values(updated_at=now))
+
+async def touch_category_banks(session: AsyncSession, category_id: int):
+    """
+    touch_banks for every bank with transactions in the category, for writes
+    that change the sign of those transactions (is_income flipped, category
+    deleted)
+    """
+    bank_ids = (await session.exec(
+        select(Transaction.bank_id).where(Transaction.category_id == category_id).distinct()
+    )).all()
+    await touch_banks(session, *bank_ids)
+
+def signed_amount():
+    """Transaction amount, negative for expense categories (needs a join with Category)"""
+    return case((Category.is_income, Transaction.amount), else_=-Transaction.amount)
+
+def _opening_query(bank_id: int, before: date):
+    """Signed sum of the bank's transactions dated before `before`"""
+    return (
+        select(func.coalesce(func.sum(signed_amount()), 0))
+        .select_from(Transaction)
+        .join(Category, Category.id == Transaction.category_id)
+        .where(Transaction.bank_id == bank_id)
+        .where(Transaction.date < before)
+    )
+
+def _daily_net_query(bank_id: int, start_date: date, end_date: date):
+    """(day, net) for every day in the range with transactions"""
+    return (
+        select(Transaction.date.label("day"), func.sum(signed_amount()).label("net"))
+        .join(Category, Category.id == Transaction.category_id)
+        .where(Transaction.bank_id == bank_id)
+        .where(Transaction.date >= start_date)
+        .where(Transaction.date <= end_date)
+        .group_by(Transaction.date)
+    )
+
+async def get_balance_history(
+    session: AsyncSession, bank: Bank, start_date: date, end_date: date
+) -> List[dict]:
+    """Closing balance for every day in [start_date, end_date]"""
+    # Setiap perubahan saldo menggeser updated_at bank (apply_balance_deltas, touch_banks,
+    # reconcile), jadi entri lama tidak terpakai lagi di worker mana pun
+    key = (bank.id, bank.updated_at, start_date, end_date)
+    cached = balance_history_cache.get(key)
+    if cached is not None:
+        return cached
+
+    # Saldo sebelum rentang: start_balance + semua transaksi sebelum start_date
+    opening = bank.start_balance + (await session.exec(_opening_query(bank.id, start_date))).one()
+
+    daily = _daily_net_query(bank.id, start_date, end_date).subquery()
+    running = select(
+        daily.c.day,
+        (opening + func.sum(daily.c.net).over(order_by=daily.c.day)).label("balance")
+    )
+    closing = {row.day: row.balance for row in (await session.exec(running)).all()}
+
+    # Hari tanpa transaksi memakai saldo hari sebelumnya
+    balance = opening
+    history = []
+    day = start_date
+    while day <= end_date:
+        balance = closing.get(day, balance)
+        history.append({"date": day, "balance": balance})
+        day += timedelta(days=1)
+
+    balance_history_cache.set(key, history)
+    return history
+
+def _reconcile_chunk(
+    session: Session, first_id: int, last_id: int, dry_run: bool, user_id: Optional[int]
+) -> List[dict]:
+    in_chunk = Bank.id.between(first_id, last_id)
+    if user_id is not None:
+        in_chunk = in_chunk & (Bank.user_id == user_id)
+
+    # Kunci bank di chunk ini dulu supaya transaksi baru menunggu sampai kita commit
+    session.exec(select(Bank.id).where(in_chunk).with_for_update()).all()
+
+    sums = (
+        select(Transaction.bank_id, func.sum(signed_amount()).label("net"))
+        .join(Category, Category.id == Transaction.category_id)
+        .where(Transaction.bank_id.between(first_id, last_id))
+        .group_by(Transaction.bank_id)
+        .subquery()
+    )
+    expected = Bank.start_balance + func.coalesce(sums.c.net, 0)
+    drifted = session.exec(
+        select(Bank.id, Bank.user_id, Bank.end_balance, expected.label("expected"))
+        .outerjoin(sums, sums.c.bank_id == Bank.id)
+        .where(in_chunk)
+        .where(Bank.end_balance != expected)
+        .order_by(Bank.id)
+    ).all()
+
+    if drifted and not dry_run:
+        now = get_utc_now()
+        # Bank dengan transaksi: satu UPDATE ... FROM (SELECT ... GROUP BY bank_id)
+        session.exec(
+            update(Bank)
+            .where(Bank.id == sums.c.bank_id)
+            .where(in_chunk)
+            .where(Bank.end_balance != Bank.start_balance + sums.c.net)
+            .values(end_balance=Bank.start_balance + sums.c.net, updated_at=now)
+        )
+        # Bank tanpa transaksi sama sekali
+        has_transactions = select(Transaction.id).where(Transaction.bank_id == Bank.id).exists()
+        session.exec(
+            update(Bank)
+            .where(in_chunk)
+            .where(~has_transactions)
+            .where(Bank.end_balance != Bank.start_balance)
+            .values(end_balance=Bank.start_balance, updated_at=now)
+        )
+    session.commit()
+
+    return [
+        {
+            "bank_id": row.id,
+            "user_id": row.user_id,
+            "stored": row.end_balance,
+            "expected": row.expected,
+            "drift": row.end_balance - row.expected
+        }
+        for row in drifted
+    ]
+
+def reconcile_balances(
+    session: Session,
+    chunk_size: int = 1000,
+    dry_run: bool = False,
+    user_id: Optional[int] = None,
+    max_reported: int = 100
+) -> dict:
+    """
+    Recompute end_balance = start_balance + signed transaction sum for every
+    bank, chunk_size banks per database transaction. Returns a drift report.
+    """
+    checked = 0
+    drifted_count = 0
+    total_drift = 0
+    reported = []
+    affected_users = set()
+    last_id = 0
+
+    while True:
+        ids_query = select(Bank.id).where(Bank.id > last_id).order_by(Bank.id).limit(chunk_size)
+        if user_id is not None:
+            ids_query = ids_query.where(Bank.user_id == user_id)
+        ids = session.exec(ids_query).all()
+        if not ids:
+            break
+
+        drifted = _reconcile_chunk(session, ids[0], ids[-1], dry_run, user_id)
+
+        checked += len(ids)
+        drifted_count += len(drifted)
+        total_drift += sum(abs(row["drift"]) for row in drifted)
+        reported.extend(drifted[:max_reported - len(reported)])
+        affected_users.update(row["user_id"] for row in drifted)
+        last_id = ids[-1]
+
+    return {
+        "dry_run": dry_run,
+        "banks_checked": checked,
+        "banks_drifted": drifted_count,
+        "total_abs_drift": total_drift,
+        "affected_user_ids": sorted(affected_users),
+        "drifted": reported
+    }
+
+def main():
+    from app.db.session import engine
+
+    parser = argparse.ArgumentParser(description="Recompute bank end_balance from transactions")
+    parser.add_argument("--dry-run", action="store_true", help="Only report drift, do not update")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Banks per database transaction")
+    parser.add_argument("--user-id", type=int, help="Only reconcile banks of this user")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    with Session(engine) as session:
+        report = reconcile_balances(session, args.chunk_size, args.dry_run, args.user_id)
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Transaction writes shared by the transaction endpoints and statement imports
+"""
+from collections import defaultdict
+from typing import Dict, Iterable, List, Type, TypeVar
+from sqlalchemy import insert, update
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.utils import get_utc_now
+from app.db.balances import apply_balance_deltas
+from app.db.rollups import add_rollup_delta, apply_rollup_deltas
+from app.models.category import Category
+from app.models.transaction import Transaction, TransactionCreate
+from app.models.user import User
+
+ModelT = TypeVar("ModelT", bound=SQLModel)
+
+async def get_owned_by_ids(
+    session: AsyncSession,
+    model: Type[ModelT],
+    user_id: int,
+    ids: Iterable[int]
+) -> Dict[int, ModelT]:
+    """Load the user's rows for the given ids with a single IN query"""
+    ids = set(ids)
+    if not ids:
+        return {}
+    query = select(model).where(model.user_id == user_id).where(model.id.in_(ids))
+    return {row.id: row for row in (await session.exec(query)).all()}
+
+async def touch_transactions(session: AsyncSession, user_id: int):
+    """
+    Bump the user's transactions_version, which the transaction list ETag is
+    built from. Every write to the user's transactions calls this before
+    committing.
+    """
+    await session.exec(
+        update(User)
+        .where(User.id == user_id)
+        .values(transactions_version=User.transactions_version + 1, transactions_updated_at=get_utc_now())
+    )
+
+async def insert_transactions(
+    session: AsyncSession,
+    user_id: int,
+    transactions: List[TransactionCreate],
+    categories: Dict[int, Category]
+) -> int:
+    """
+    Insert already-validated transactions with one batched INSERT, then
+    apply one end_balance delta per bank and the matching rollup deltas.
+    The caller owns the commit.
+    """
+    if not transactions:
+        return 0
+
+    now = get_utc_now()
+    rows = []
+    bank_deltas: Dict[int, int] = defaultdict(int)
+    rollup_deltas = {}
+
+    for transaction in transactions:
+        rows.append({
+            **transaction.dict(),
+            "user_id": user_id,
+            "created_at": now,
+            "updated_at": now
+        })
+        is_income = categories[transaction.category_id].is_income
+        bank_deltas[transaction.bank_id] += transaction.amount if is_income else -transaction.amount
+        add_rollup_delta(
+            rollup_deltas, user_id, transaction.bank_id, transaction.category_id,
+            transaction.date, transaction.amount, 1
+        )
+
+    await session.exec(insert(Transaction), params=rows)
+
+    await apply_balance_deltas(session, bank_deltas)
+    await apply_rollup_deltas(session, rollup_deltas)
+    await touch_transactions(session, user_id)
+    return len(rows)
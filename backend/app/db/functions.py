@@ -0,0 +1,43 @@
+# app/db/functions.py
+"""
+SQL functions that need different syntax on PostgreSQL and SQLite
+"""
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.sql.visitors import InternalTraversal
+from sqlalchemy.types import Date
+
+# Interval yang didukung oleh period_start
+PERIOD_INTERVALS = ("day", "week", "month")
+
+class period_start(FunctionElement):
+    """First day of the day/week/month containing a DATE column (weeks start on Monday)"""
+    type = Date()
+    inherit_cache = True
+    name = "period_start"
+    # interval ikut cache key, kalau tidak query day/week/month berbagi SQL yang sama
+    _traverse_internals = FunctionElement._traverse_internals + [
+        ("interval", InternalTraversal.dp_string)
+    ]
+
+    def __init__(self, interval: str, column):
+        if interval not in PERIOD_INTERVALS:
+            raise ValueError(f"Unsupported interval: {interval}")
+        self.interval = interval
+        super().__init__(column)
+
+@compiles(period_start)
+def _period_start_default(element, compiler, **kw):
+    column = compiler.process(list(element.clauses)[0], **kw)
+    if element.interval == "day":
+        return column
+    return f"CAST(date_trunc('{element.interval}', {column}) AS DATE)"
+
+@compiles(period_start, "sqlite")
+def _period_start_sqlite(element, compiler, **kw):
+    column = compiler.process(list(element.clauses)[0], **kw)
+    if element.interval == "day":
+        return column
+    if element.interval == "week":
+        return f"date({column}, 'weekday 0', '-6 days')"
+    return f"date({column}, 'start of month')"
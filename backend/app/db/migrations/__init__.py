@@ -0,0 +1,136 @@
+"""
+Versioned schema migrations.
+
+Every module in app/db/migrations/versions defines `version`, `description`,
+`upgrade(connection)` and `downgrade(connection)`, plus `transactional = False`
+when it needs autocommit (e.g. CREATE INDEX CONCURRENTLY). Applied versions
+are recorded in the schema_migrations table.
+
+    python -m app.db.migrations upgrade          # to the latest version
+    python -m app.db.migrations downgrade 5      # back to version 5
+    python -m app.db.migrations current
+    python -m app.db.migrations history
+    python -m app.db.migrations stamp 1          # pre-migration database = version 1, then upgrade
+"""
+import importlib
+import logging
+import pkgutil
+from types import ModuleType
+from typing import List, Optional
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, inspect, select
+from sqlalchemy.engine import Connection, Engine
+from app.core.utils import get_utc_now
+
+logger = logging.getLogger(__name__)
+
+_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+class MigrationError(RuntimeError):
+    pass
+
+def load_migrations() -> List[ModuleType]:
+    from app.db.migrations import versions
+
+    modules = [
+        importlib.import_module(f"{versions.__name__}.{info.name}")
+        for info in pkgutil.iter_modules(versions.__path__)
+    ]
+    modules.sort(key=lambda module: module.version)
+    numbers = [module.version for module in modules]
+    if numbers != list(range(1, len(numbers) + 1)):
+        raise MigrationError(f"Migration versions must be 1..n without gaps, got {numbers}")
+    return modules
+
+def head_version() -> int:
+    migrations = load_migrations()
+    return migrations[-1].version if migrations else 0
+
+def current_version(engine: Engine) -> Optional[int]:
+    """Latest applied version, 0 for an empty database, None for an unversioned one"""
+    with engine.connect() as connection:
+        tables = inspect(connection).get_table_names()
+        if "schema_migrations" not in tables:
+            # Tabel aplikasi sudah ada tapi belum pernah di-stamp
+            return None if "users" in tables else 0
+        return connection.execute(select(func.coalesce(func.max(schema_migrations.c.version), 0))).scalar_one()
+
+def _require_version(engine: Engine) -> int:
+    version = current_version(engine)
+    if version is None:
+        raise MigrationError(
+            "Database has tables but no schema_migrations; "
+            "a database from before versioned migrations matches version 1: run "
+            "`python -m app.db.migrations stamp 1`, then `upgrade`"
+        )
+    return version
+
+def _run(engine: Engine, migration: ModuleType, direction: str):
+    def apply(connection: Connection):
+        getattr(migration, direction)(connection)
+        if direction == "upgrade":
+            connection.execute(schema_migrations.insert().values(
+                version=migration.version,
+                description=migration.description,
+                applied_at=get_utc_now()
+            ))
+        else:
+            connection.execute(
+                schema_migrations.delete().where(schema_migrations.c.version == migration.version)
+            )
+
+    logger.info(f"{direction} {migration.version:04d}: {migration.description}")
+    if getattr(migration, "transactional", True):
+        with engine.begin() as connection:
+            apply(connection)
+    else:
+        # Tidak bisa di dalam transaksi; upgrade-nya harus aman diulang kalau gagal di tengah
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            apply(connection)
+
+def upgrade(engine: Engine, target: Optional[int] = None) -> int:
+    version = _require_version(engine)
+    _metadata.create_all(engine)
+    target = head_version() if target is None else target
+    for migration in load_migrations():
+        if version < migration.version <= target:
+            _run(engine, migration, "upgrade")
+            version = migration.version
+    return version
+
+def downgrade(engine: Engine, target: int) -> int:
+    version = _require_version(engine)
+    for migration in reversed(load_migrations()):
+        if target < migration.version <= version:
+            _run(engine, migration, "downgrade")
+            version = migration.version - 1
+    return version
+
+def stamp(engine: Engine, target: int):
+    """Record versions 1..target as applied without running them"""
+    _metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(schema_migrations.delete())
+        for migration in load_migrations():
+            if migration.version <= target:
+                connection.execute(schema_migrations.insert().values(
+                    version=migration.version,
+                    description=migration.description,
+                    applied_at=get_utc_now()
+                ))
+
+def check_schema_version(engine: Engine):
+    """Called on startup: fail fast instead of touching the schema"""
+    version = _require_version(engine)
+    head = head_version()
+    if version != head:
+        raise MigrationError(
+            f"Database schema is at version {version}, this code needs {head}; "
+            "run `python -m app.db.migrations upgrade`"
+        )
@@ -0,0 +1,36 @@
+import argparse
+import logging
+from app.db.migrations import current_version, downgrade, head_version, load_migrations, stamp, upgrade
+from app.db.session import engine
+
+def main():
+    parser = argparse.ArgumentParser(description="Versioned database migrations")
+    commands = parser.add_subparsers(dest="command", required=True)
+    upgrade_parser = commands.add_parser("upgrade", help="Apply pending migrations")
+    upgrade_parser.add_argument("--to", type=int, help="Stop at this version (default: latest)")
+    downgrade_parser = commands.add_parser("downgrade", help="Revert migrations above a version")
+    downgrade_parser.add_argument("target", type=int, help="Version to go back to (0 = empty)")
+    stamp_parser = commands.add_parser("stamp", help="Mark versions as applied without running them")
+    stamp_parser.add_argument("target", type=int)
+    commands.add_parser("current", help="Show the database version")
+    commands.add_parser("history", help="List all migrations")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if args.command == "upgrade":
+        print(f"Database at version {upgrade(engine, args.to)}")
+    elif args.command == "downgrade":
+        print(f"Database at version {downgrade(engine, args.target)}")
+    elif args.command == "stamp":
+        stamp(engine, args.target)
+        print(f"Database stamped at version {args.target}")
+    elif args.command == "current":
+        version = current_version(engine)
+        print("unversioned" if version is None else f"{version} (latest: {head_version()})")
+    else:
+        for migration in load_migrations():
+            mode = "" if getattr(migration, "transactional", True) else " [autocommit]"
+            print(f"{migration.version:04d} {migration.description}{mode}")
+
+if __name__ == "__main__":
+    main()
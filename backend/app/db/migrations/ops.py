@@ -0,0 +1,27 @@
+"""
+Small DDL helpers for migrations that need different SQL per dialect
+"""
+from sqlalchemy.engine import Connection
+
+def _concurrently(connection: Connection) -> str:
+    # CONCURRENTLY hanya di PostgreSQL dan hanya di luar transaksi (migrasi non-transactional)
+    autocommit = connection.get_execution_options().get("isolation_level") == "AUTOCOMMIT"
+    return "CONCURRENTLY " if connection.dialect.name == "postgresql" and autocommit else ""
+
+def create_index(connection: Connection, name: str, definition: str):
+    """
+    CREATE INDEX [CONCURRENTLY] name ON definition. A half-built (INVALID)
+    index left by an interrupted concurrent build is dropped first.
+    """
+    concurrently = _concurrently(connection)
+    connection.exec_driver_sql(f"DROP INDEX {concurrently}IF EXISTS {name}")
+    connection.exec_driver_sql(f"CREATE INDEX {concurrently}{name} ON {definition}")
+
+def drop_index(connection: Connection, name: str):
+    connection.exec_driver_sql(f"DROP INDEX {_concurrently(connection)}IF EXISTS {name}")
+
+def add_column(connection: Connection, table: str, column_ddl: str):
+    connection.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {column_ddl}")
+
+def drop_column(connection: Connection, table: str, column: str):
+    connection.exec_driver_sql(f"ALTER TABLE {table} DROP COLUMN {column}")
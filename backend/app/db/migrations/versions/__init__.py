@@ -0,0 +1 @@
+"""Migration modules, one per schema version (vNNNN_name.py)"""
@@ -0,0 +1,69 @@
+"""
+Initial schema: users, categories, banks and transactions as they were
+before versioned migrations (including the old user_id indexes).
+"""
+from sqlalchemy import (
+    Boolean, Column, Date, DateTime, ForeignKey, Index, Integer, MetaData, String, Table
+)
+from sqlalchemy.engine import Connection
+
+version = 1
+description = "Initial schema"
+
+# Salinan beku, jangan diubah ikut model; perubahan berikutnya masuk migrasi baru
+metadata = MetaData()
+
+def _timestamps():
+    return [
+        Column("created_at", DateTime, nullable=False),
+        Column("updated_at", DateTime, nullable=False),
+    ]
+
+users = Table(
+    "users", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("fullname", String(100), nullable=False),
+    Column("username", String(50), nullable=False),
+    Column("email", String(50), nullable=False),
+    Column("is_active", Boolean, nullable=False),
+    Column("password", String(255), nullable=False),
+    *_timestamps(),
+)
+categories = Table(
+    "categories", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(100), nullable=False),
+    Column("is_income", Boolean, nullable=False),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=False),
+    *_timestamps(),
+    Index("idx_categories_user_id", "user_id"),
+)
+banks = Table(
+    "banks", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(100), nullable=False),
+    Column("color", String(50), nullable=False),
+    Column("start_balance", Integer, nullable=False),
+    Column("end_balance", Integer, nullable=False),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=False),
+    *_timestamps(),
+    Index("idx_banks_user_id", "user_id"),
+)
+transactions = Table(
+    "transactions", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("date", Date, nullable=False),
+    Column("amount", Integer, nullable=False),
+    Column("description", String(255), nullable=False),
+    Column("category_id", Integer, ForeignKey("categories.id"), nullable=False),
+    Column("bank_id", Integer, ForeignKey("banks.id"), nullable=False),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=False),
+    *_timestamps(),
+    Index("idx_transactions_user_id", "user_id"),
+)
+
+def upgrade(connection: Connection):
+    metadata.create_all(connection)
+
+def downgrade(connection: Connection):
+    metadata.drop_all(connection)
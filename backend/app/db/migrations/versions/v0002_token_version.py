@@ -0,0 +1,11 @@
+from sqlalchemy.engine import Connection
+from app.db.migrations.ops import add_column, drop_column
+
+version = 2
+description = "users.token_version for revoking stateless access tokens"
+
+def upgrade(connection: Connection):
+    add_column(connection, "users", "token_version INTEGER NOT NULL DEFAULT 0")
+
+def downgrade(connection: Connection):
+    drop_column(connection, "users", "token_version")
@@ -0,0 +1,12 @@
+from sqlalchemy.engine import Connection
+from app.db.migrations.ops import create_index, drop_index
+
+version = 3
+description = "Keyset pagination index for GET /transactions"
+transactional = False
+
+def upgrade(connection: Connection):
+    create_index(connection, "ix_transactions_user_date_id", "transactions(user_id, date DESC, id DESC)")
+
+def downgrade(connection: Connection):
+    drop_index(connection, "ix_transactions_user_date_id")
@@ -0,0 +1,49 @@
+"""
+Monthly transaction rollups, backfilled from existing transactions
+"""
+from sqlalchemy import Column, Date, Integer, MetaData, Table, func, select
+from sqlalchemy.engine import Connection
+from app.db.functions import period_start
+
+version = 4
+description = "transaction_rollups table"
+
+metadata = MetaData()
+transaction_rollups = Table(
+    "transaction_rollups", metadata,
+    Column("user_id", Integer, primary_key=True),
+    Column("month", Date, primary_key=True),
+    Column("bank_id", Integer, primary_key=True),
+    Column("category_id", Integer, primary_key=True),
+    Column("total_amount", Integer, nullable=False),
+    Column("count", Integer, nullable=False),
+)
+transactions = Table(
+    "transactions", MetaData(),
+    Column("id", Integer),
+    Column("user_id", Integer),
+    Column("date", Date),
+    Column("bank_id", Integer),
+    Column("category_id", Integer),
+    Column("amount", Integer),
+)
+
+def upgrade(connection: Connection):
+    metadata.create_all(connection)
+    month = period_start("month", transactions.c.date)
+    connection.execute(transaction_rollups.insert().from_select(
+        ["user_id", "month", "bank_id", "category_id", "total_amount", "count"],
+        select(
+            transactions.c.user_id,
+            month,
+            transactions.c.bank_id,
+            transactions.c.category_id,
+            func.sum(transactions.c.amount),
+            func.count(transactions.c.id)
+        ).group_by(
+            transactions.c.user_id, month, transactions.c.bank_id, transactions.c.category_id
+        )
+    ))
+
+def downgrade(connection: Connection):
+    metadata.drop_all(connection)
@@ -0,0 +1,11 @@
+from sqlalchemy.engine import Connection
+from app.db.migrations.ops import add_column, drop_column
+
+version = 5
+description = "users.is_superuser for /api/v1/admin"
+
+def upgrade(connection: Connection):
+    add_column(connection, "users", "is_superuser BOOLEAN NOT NULL DEFAULT FALSE")
+
+def downgrade(connection: Connection):
+    drop_column(connection, "users", "is_superuser")
@@ -0,0 +1,11 @@
+from sqlalchemy.engine import Connection
+from app.db.migrations.ops import add_column, drop_column
+
+version = 6
+description = "users.timezone, NULL means settings.TIMEZONE"
+
+def upgrade(connection: Connection):
+    add_column(connection, "users", "timezone VARCHAR(64)")
+
+def downgrade(connection: Connection):
+    drop_column(connection, "users", "timezone")
@@ -0,0 +1,25 @@
+from sqlalchemy.engine import Connection
+from app.db.migrations.ops import create_index, drop_index
+
+version = 7
+description = "Composite transaction indexes for bank/category filters"
+transactional = False
+
+# (name, definition), sama dengan index di app/models/transaction.py
+TRANSACTION_INDEXES = [
+    ("ix_transactions_user_bank_date_id", "transactions(user_id, bank_id, date DESC, id DESC)"),
+    ("ix_transactions_user_category_date_id", "transactions(user_id, category_id, date DESC, id DESC)"),
+    ("ix_transactions_bank_date", "transactions(bank_id, date)"),
+    ("ix_transactions_category_id", "transactions(category_id)"),
+]
+
+def upgrade(connection: Connection):
+    for name, definition in TRANSACTION_INDEXES:
+        create_index(connection, name, definition)
+    # Prefix dari ix_transactions_user_date_id, hanya menambah biaya write
+    drop_index(connection, "idx_transactions_user_id")
+
+def downgrade(connection: Connection):
+    create_index(connection, "idx_transactions_user_id", "transactions(user_id)")
+    for name, _ in reversed(TRANSACTION_INDEXES):
+        drop_index(connection, name)
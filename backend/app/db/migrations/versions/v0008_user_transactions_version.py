@@ -0,0 +1,13 @@
+from sqlalchemy.engine import Connection
+from app.db.migrations.ops import add_column, drop_column
+
+version = 8
+description = "users.transactions_version/transactions_updated_at for the transaction list ETag"
+
+def upgrade(connection: Connection):
+    add_column(connection, "users", "transactions_version INTEGER NOT NULL DEFAULT 0")
+    add_column(connection, "users", "transactions_updated_at TIMESTAMP")
+
+def downgrade(connection: Connection):
+    drop_column(connection, "users", "transactions_updated_at")
+    drop_column(connection, "users", "transactions_version")
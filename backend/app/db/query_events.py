@@ -0,0 +1,45 @@
+# app/db/query_events.py
+"""
+Engine event hooks: add every statement's time and row count to the
+current request (app/core/timing.py) and log statements slower than
+SLOW_QUERY_MS together with their parameters.
+"""
+import logging
+import time
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+from app.core.timing import current_request_stats
+
+logger = logging.getLogger(__name__)
+
+MAX_LOGGED_PARAMS = 1000  # Karakter; executemany bisa membawa ribuan baris
+
+def _before_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+    context._query_started = time.perf_counter()
+
+def _after_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_started
+
+    stats = current_request_stats()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_time += elapsed
+        # Jumlah baris menurut driver: hasil SELECT di PostgreSQL, baris yang diubah di DML.
+        # SQLite tidak melaporkan jumlah baris SELECT (-1).
+        if cursor.rowcount > 0:
+            stats.rows += cursor.rowcount
+
+    if 0 < settings.SLOW_QUERY_MS <= elapsed * 1000:
+        logged = repr(parameters)
+        if len(logged) > MAX_LOGGED_PARAMS:
+            logged = logged[:MAX_LOGGED_PARAMS] + "..."
+        logger.warning(
+            f"Slow query ({elapsed * 1000:.1f} ms{', executemany' if executemany else ''}): "
+            f"{statement} | params: {logged}"
+        )
+
+def install_query_hooks(engine: Engine):
+    """Register the hooks on a sync engine (use async_engine.sync_engine for async engines)"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,114 @@
+"""
+Monthly transaction rollups, maintained in the same commit as every
+transaction write. Run `python -m app.db.rollups` to rebuild the table
+from scratch (e.g. after deploying it on a database with existing data).
+"""
+import argparse
+import logging
+from datetime import date
+from typing import Dict, Optional, Tuple
+from sqlalchemy import delete, func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.db.functions import period_start
+from app.models.rollup import TransactionRollup
+from app.models.transaction import Transaction
+
+logger = logging.getLogger(__name__)
+
+# (user_id, month, bank_id, category_id) -> (total_amount, count)
+RollupDeltas = Dict[Tuple[int, date, int, int], Tuple[int, int]]
+
+def month_of(day: date) -> date:
+    return day.replace(day=1)
+
+def add_rollup_delta(
+    deltas: RollupDeltas,
+    user_id: int,
+    bank_id: int,
+    category_id: int,
+    day: date,
+    amount: int,
+    count: int
+):
+    """Accumulate a change so several rows hitting the same month cost one upsert"""
+    key = (user_id, month_of(day), bank_id, category_id)
+    total, rows = deltas.get(key, (0, 0))
+    deltas[key] = (total + amount, rows + count)
+
+def _upsert_statement(dialect_name: str):
+    insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+    stmt = insert(TransactionRollup)
+    return stmt.on_conflict_do_update(
+        index_elements=["user_id", "month", "bank_id", "category_id"],
+        set_={
+            "total_amount": TransactionRollup.total_amount + stmt.excluded.total_amount,
+            "count": TransactionRollup.count + stmt.excluded.count,
+        }
+    )
+
+async def apply_rollup_deltas(session: AsyncSession, deltas: RollupDeltas):
+    """Upsert accumulated deltas; caller commits together with the transaction rows"""
+    rows = [
+        {
+            "user_id": user_id,
+            "month": month,
+            "bank_id": bank_id,
+            "category_id": category_id,
+            "total_amount": total,
+            "count": count,
+        }
+        for (user_id, month, bank_id, category_id), (total, count) in deltas.items()
+        if total or count
+    ]
+    # Urutan kunci tetap seperti apply_balance_deltas: dua edit yang memindahkan transaksi
+    # Jan -> Feb dan Feb -> Jan tidak mengunci baris rollup dalam urutan terbalik
+    rows.sort(key=lambda row: (row["user_id"], row["bank_id"], row["category_id"], row["month"]))
+    if not rows:
+        return
+    await session.exec(_upsert_statement(session.bind.dialect.name), params=rows)
+
+def rebuild_rollups(session: Session, user_id: Optional[int] = None) -> int:
+    """Recompute rollups from the transactions table, returns the number of rows written"""
+    month = period_start("month", Transaction.date)
+    source = (
+        select(
+            Transaction.user_id,
+            month,
+            Transaction.bank_id,
+            Transaction.category_id,
+            func.sum(Transaction.amount),
+            func.count(Transaction.id)
+        )
+        .group_by(Transaction.user_id, month, Transaction.bank_id, Transaction.category_id)
+    )
+    clear = delete(TransactionRollup)
+    if user_id is not None:
+        source = source.where(Transaction.user_id == user_id)
+        clear = clear.where(TransactionRollup.user_id == user_id)
+
+    session.exec(clear)
+    result = session.exec(
+        TransactionRollup.__table__.insert().from_select(
+            ["user_id", "month", "bank_id", "category_id", "total_amount", "count"],
+            source
+        )
+    )
+    session.commit()
+    return result.rowcount
+
+def main():
+    from app.db.session import engine
+
+    parser = argparse.ArgumentParser(description="Rebuild monthly transaction rollups")
+    parser.add_argument("--user-id", type=int, help="Only rebuild rollups for this user")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    with Session(engine) as session:
+        written = rebuild_rollups(session, args.user_id)
+    logger.info(f"Rebuilt transaction rollups: {written} rows")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""
+Fast synthetic data for benchmarks and local testing. Rows come from a
+seeded RNG, so the same arguments always produce the same dataset:
+
+    python -m app.db.seed --users 1000 --transactions 10000000
+
+Transactions are streamed in batches with COPY on PostgreSQL and
+executemany elsewhere. Every user shares one precomputed password hash.
+Transaction indexes, bank end_balance and the monthly rollups are built
+once at the end.
+"""
+import argparse
+import csv
+import io
+import logging
+import random
+import time
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy import bindparam, func, insert, inspect, update
+from sqlalchemy.engine import Connection, Engine
+from sqlmodel import Session, select
+from app.core.security import get_password_hash
+from app.core.utils import get_utc_now
+from app.db.rollups import rebuild_rollups
+from app.models.bank import Bank
+from app.models.category import Category
+from app.models.transaction import Transaction
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+TRANSACTION_COLUMNS = (
+    "date", "amount", "description", "category_id", "bank_id", "user_id", "created_at", "updated_at"
+)
+
+def count_seeded_users(engine: Engine, prefix: str) -> int:
+    with engine.connect() as connection:
+        return connection.execute(
+            select(func.count()).select_from(User).where(User.username.startswith(prefix))
+        ).scalar_one()
+
+def _insert_accounts(
+    connection: Connection,
+    users: int,
+    banks_per_user: int,
+    categories_per_user: int,
+    income_categories: int,
+    start_balance: int,
+    prefix: str,
+    password: str
+):
+    now = get_utc_now()
+    stamps = {"created_at": now, "updated_at": now}
+    # Satu hash bcrypt untuk semua user
+    password_hash = get_password_hash(password)
+    connection.execute(insert(User), [
+        {"fullname": f"Seed User {n}", "username": f"{prefix}{n}", "email": f"{prefix}{n}@example.com",
+         "password": password_hash, "is_active": True, "token_version": 0, "is_superuser": False, **stamps}
+        for n in range(users)
+    ])
+    user_ids = connection.execute(
+        select(User.id).where(User.username.startswith(prefix)).order_by(User.id)
+    ).scalars().all()
+
+    connection.execute(insert(Bank), [
+        {"name": f"Bank {n}", "color": "#000000", "start_balance": start_balance,
+         "end_balance": start_balance, "user_id": user_id, **stamps}
+        for user_id in user_ids for n in range(banks_per_user)
+    ])
+    connection.execute(insert(Category), [
+        {"name": f"Category {n}", "is_income": n < income_categories, "user_id": user_id, **stamps}
+        for user_id in user_ids for n in range(categories_per_user)
+    ])
+
+    banks: Dict[int, List[int]] = {}
+    for bank_id, user_id in connection.execute(
+        select(Bank.id, Bank.user_id).where(Bank.user_id.in_(user_ids)).order_by(Bank.id)
+    ):
+        banks.setdefault(user_id, []).append(bank_id)
+    categories: Dict[int, List[tuple]] = {}
+    for category_id, user_id, is_income in connection.execute(
+        select(Category.id, Category.user_id, Category.is_income)
+        .where(Category.user_id.in_(user_ids))
+        .order_by(Category.id)
+    ):
+        categories.setdefault(user_id, []).append((category_id, is_income))
+    return user_ids, banks, categories
+
+class _TransactionWriter:
+    """Batches go out with COPY on PostgreSQL and a driver-level executemany elsewhere"""
+    def __init__(self, connection: Connection):
+        self.connection = connection
+        self.copy = connection.dialect.name == "postgresql"
+        compiled = insert(Transaction.__table__).compile(
+            dialect=connection.dialect, column_keys=list(TRANSACTION_COLUMNS)
+        )
+        self.sql = compiled.string
+        self.order = (
+            [TRANSACTION_COLUMNS.index(name) for name in compiled.positiontup]
+            if compiled.positional else None
+        )
+
+    def value(self, column: str, value):
+        """Driver-ready value, computed once for values shared by many rows"""
+        if self.copy:
+            return value
+        process = Transaction.__table__.c[column].type.bind_processor(self.connection.dialect)
+        return process(value) if process else value
+
+    def write(self, rows: List[tuple]):
+        if self.copy:
+            # COPY lewat koneksi DBAPI yang sama, jadi tetap di dalam transaksi ini
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(rows)
+            buffer.seek(0)
+            with self.connection.connection.cursor() as cursor:
+                cursor.copy_expert(
+                    f"COPY transactions ({', '.join(TRANSACTION_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                    buffer
+                )
+        elif self.order is not None:
+            self.connection.exec_driver_sql(self.sql, [tuple(row[i] for i in self.order) for row in rows])
+        else:
+            self.connection.exec_driver_sql(self.sql, [dict(zip(TRANSACTION_COLUMNS, row)) for row in rows])
+
+def seed_database(
+    engine: Engine,
+    users: int = 1000,
+    transactions: int = 1_000_000,
+    banks_per_user: int = 3,
+    categories_per_user: int = 8,
+    income_categories: int = 2,
+    first_day: date = date(2020, 1, 1),
+    days: int = 5 * 365,
+    start_balance: int = 10_000_000,
+    seed: int = 42,
+    prefix: str = "seed_",
+    password: str = "password123",
+    batch_size: int = 50_000,
+    defer_indexes: bool = True
+) -> dict:
+    """
+    Insert `users` users with their banks and categories plus `transactions`
+    transactions spread round-robin over them. Returns row counts and timings.
+    With defer_indexes the transaction indexes are dropped during the load
+    and built once at the end, which is much faster than updating them per row.
+    """
+    rng = random.Random(seed)
+    started = time.perf_counter()
+
+    with engine.begin() as connection:
+        user_ids, banks, categories = _insert_accounts(
+            connection, users, banks_per_user, categories_per_user,
+            income_categories, start_balance, prefix, password
+        )
+        accounts_seconds = time.perf_counter() - started
+
+        deferred = []
+        if defer_indexes:
+            existing = {index["name"] for index in inspect(connection).get_indexes("transactions")}
+            deferred = [index for index in Transaction.__table__.indexes if index.name in existing]
+            for index in deferred:
+                index.drop(connection)
+
+        writer = _TransactionWriter(connection)
+        now = writer.value("created_at", get_utc_now())
+        day_values = [writer.value("date", first_day + timedelta(days=offset)) for offset in range(days)]
+        # Selisih saldo per bank dihitung saat generate, bukan di-scan ulang
+        balance_deltas: Dict[int, int] = {}
+        randrange, choice, randint = rng.randrange, rng.choice, rng.randint
+        batch = []
+        for n in range(transactions):
+            user_id = user_ids[n % len(user_ids)]
+            bank_id = choice(banks[user_id])
+            category_id, is_income = choice(categories[user_id])
+            amount = randint(1_000, 5_000_000)
+            balance_deltas[bank_id] = balance_deltas.get(bank_id, 0) + (amount if is_income else -amount)
+            batch.append((
+                day_values[randrange(days)], amount, f"Transaction {n}",
+                category_id, bank_id, user_id, now, now
+            ))
+            if len(batch) == batch_size:
+                writer.write(batch)
+                batch.clear()
+                if (n + 1) % (batch_size * 20) == 0:
+                    logger.info(f"{n + 1} transactions written")
+        if batch:
+            writer.write(batch)
+        transactions_seconds = time.perf_counter() - started - accounts_seconds
+
+        for index in deferred:
+            index.create(connection)
+        indexes_seconds = time.perf_counter() - started - accounts_seconds - transactions_seconds
+
+        if balance_deltas:
+            connection.execute(
+                update(Bank)
+                .where(Bank.id == bindparam("bank_id"))
+                .values(end_balance=Bank.start_balance + bindparam("delta")),
+                [{"bank_id": bank_id, "delta": delta} for bank_id, delta in balance_deltas.items()]
+            )
+
+    with Session(engine) as session:
+        rollups = rebuild_rollups(session)
+    if engine.dialect.name == "postgresql":
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            connection.exec_driver_sql("ANALYZE")
+
+    return {
+        "users": len(user_ids),
+        "banks": sum(len(ids) for ids in banks.values()),
+        "categories": sum(len(ids) for ids in categories.values()),
+        "transactions": transactions,
+        "rollups": rollups,
+        "accounts_seconds": round(accounts_seconds, 2),
+        "transactions_seconds": round(transactions_seconds, 2),
+        "indexes_seconds": round(indexes_seconds, 2),
+        "total_seconds": round(time.perf_counter() - started, 2),
+    }
+
+def main(argv: Optional[List[str]] = None):
+    from app.db.session import engine
+
+    parser = argparse.ArgumentParser(description="Generate a large synthetic dataset")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--transactions", type=int, default=1_000_000)
+    parser.add_argument("--banks-per-user", type=int, default=3)
+    parser.add_argument("--categories-per-user", type=int, default=8)
+    parser.add_argument("--income-categories", type=int, default=2, help="How many of a user's categories are income")
+    parser.add_argument("--first-day", type=date.fromisoformat, default=date(2020, 1, 1))
+    parser.add_argument("--days", type=int, default=5 * 365, help="Transaction dates span this many days")
+    parser.add_argument("--seed", type=int, default=42, help="RNG seed, same seed gives the same data")
+    parser.add_argument("--prefix", default="seed_", help="Username prefix, must not be in use yet")
+    parser.add_argument("--password", default="password123", help="Password of every generated user")
+    parser.add_argument("--batch-size", type=int, default=50_000, help="Transactions per COPY/executemany")
+    parser.add_argument("--keep-indexes", action="store_true", help="Do not drop transaction indexes during the load")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    if count_seeded_users(engine, args.prefix):
+        parser.error(f"Users with prefix {args.prefix!r} already exist; pick another --prefix")
+
+    report = seed_database(
+        engine, args.users, args.transactions, args.banks_per_user, args.categories_per_user,
+        args.income_categories, args.first_day, args.days, seed=args.seed, prefix=args.prefix,
+        password=args.password, batch_size=args.batch_size, defer_indexes=not args.keep_indexes
+    )
+    logger.info(f"Seeded {report}")
+
+if __name__ == "__main__":
+    main()
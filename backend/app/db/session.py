@@ -1,24 +1,75 @@
 # app/db/session.py
-from sqlmodel import SQLModel, create_engine, Session
+from sqlmodel import create_engine, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from app.core.config import settings
+from app.db.pool import InstrumentedQueuePool, InstrumentedAsyncQueuePool
+from app.db.query_events import install_query_hooks
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Driver async untuk setiap driver sync yang didukung
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def get_async_database_url(url: str) -> str:
+    """Translate a sync DATABASE_URL into its async driver equivalent"""
+    scheme, sep, rest = url.partition("://")
+    return ASYNC_DRIVERS.get(scheme, scheme) + sep + rest
+
+def get_pool_options() -> dict:
+    """Pool settings shared by the sync and async engines"""
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
 engine = create_engine(
     settings.DATABASE_URL,
-    echo=True  # Untuk melihat SQL queries
+    echo=settings.DB_ECHO,
+    poolclass=InstrumentedQueuePool,
+    **get_pool_options()
+)
+
+async_engine = create_async_engine(
+    get_async_database_url(settings.DATABASE_URL),
+    echo=settings.DB_ECHO,
+    poolclass=InstrumentedAsyncQueuePool,
+    **get_pool_options()
+)
+
+# Waktu, jumlah query dan baris per request, plus log query lambat
+install_query_hooks(engine)
+install_query_hooks(async_engine.sync_engine)
+
+async_session_factory = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    expire_on_commit=False
 )
 
 def init_db():
+    """Bring the schema to the latest migration; existing data is kept"""
+    from app.db.migrations import upgrade
+
     try:
-        SQLModel.metadata.drop_all(engine)  # Hapus semua tabel yang ada
-        SQLModel.metadata.create_all(engine)
-        logger.info("Database initialized successfully")
+        version = upgrade(engine)
+        logger.info(f"Database initialized successfully (schema version {version})")
     except Exception as e:
         logger.error(f"Error initializing database: {e}")
         raise e
 
 def get_session():
     with Session(engine) as session:
-        yield session
\ No newline at end of file
+        yield session
+
+async def get_async_session():
+    async with async_session_factory() as session:
+        yield session
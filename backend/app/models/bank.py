@@ -1,6 +1,8 @@
 # app/models/bank.py
 from datetime import datetime
+import datetime as dt
 from typing import Optional, List
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
 from app.models.base import TimestampModel
 from app.schemas.base import TimestampResponseMixin
@@ -28,6 +30,8 @@ class Bank(BankBase, TimestampModel, table=True):
     transactions: List["Transaction"] = Relationship(back_populates="bank")
     user: User = Relationship(back_populates="banks")
 
+Index("idx_banks_user_id", Bank.user_id)
+
 class BankCreate(BankBase):
     pass
 
@@ -38,4 +42,9 @@ class BankRead(BankBase, TimestampResponseMixin):
 class BankUpdate(SQLModel):
     name: Optional[str] = None
     color: Optional[str] = None
-    start_balance: Optional[int] = None
\ No newline at end of file
+    start_balance: Optional[int] = None
+
+# Saldo akhir hari untuk GET /banks/{bank_id}/balance-history
+class BankBalancePoint(SQLModel):
+    date: dt.date
+    balance: int
@@ -1,5 +1,6 @@
 from datetime import datetime
 from typing import Optional, List
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
 from app.models.base import TimestampModel
 from app.schemas.base import TimestampResponseMixin
@@ -17,6 +18,8 @@ class Category(CategoryBase, TimestampModel, table=True):
     transactions: List["Transaction"] = Relationship(back_populates="category")
     user: User = Relationship(back_populates="categories")
 
+Index("idx_categories_user_id", Category.user_id)
+
 class CategoryCreate(CategoryBase):
     pass
 
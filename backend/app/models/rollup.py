@@ -0,0 +1,15 @@
+# app/models/rollup.py
+from datetime import date
+from sqlmodel import SQLModel, Field
+
+# Tabel turunan dari transactions, bisa dibangun ulang dengan `python -m app.db.rollups`.
+# Sengaja tanpa foreign key supaya hapus bank/kategori tidak terhalang baris rollup.
+class TransactionRollup(SQLModel, table=True):
+    __tablename__ = "transaction_rollups"
+
+    user_id: int = Field(primary_key=True)
+    month: date = Field(primary_key=True)  # Tanggal 1 di bulan tersebut
+    bank_id: int = Field(primary_key=True)
+    category_id: int = Field(primary_key=True)
+    total_amount: int = Field(default=0)
+    count: int = Field(default=0)
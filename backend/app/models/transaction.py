@@ -1,11 +1,14 @@
 # app/models/transaction.py
 from datetime import datetime, date
+import datetime as dt
+from enum import Enum
 from typing import Optional
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
 from app.models.base import TimestampModel
 from app.schemas.base import TimestampResponseMixin
-from app.models.category import Category
-from app.models.bank import Bank
+from app.models.category import Category, CategoryRead
+from app.models.bank import Bank, BankRead
 from app.models.user import User
 
 class TransactionBase(SQLModel):
@@ -25,6 +28,34 @@ class Transaction(TransactionBase, TimestampModel, table=True):
     bank: Bank = Relationship(back_populates="transactions")
     user: User = Relationship()
 
+# Cocok dengan urutan keyset pagination di GET /transactions
+Index(
+    "ix_transactions_user_date_id",
+    Transaction.user_id,
+    Transaction.date.desc(),
+    Transaction.id.desc()
+)
+
+# Filter bank_id / category_id di GET /transactions dan summary, dengan urutan yang sama
+Index(
+    "ix_transactions_user_bank_date_id",
+    Transaction.user_id,
+    Transaction.bank_id,
+    Transaction.date.desc(),
+    Transaction.id.desc()
+)
+Index(
+    "ix_transactions_user_category_date_id",
+    Transaction.user_id,
+    Transaction.category_id,
+    Transaction.date.desc(),
+    Transaction.id.desc()
+)
+
+# Balance history/reconcile per bank, dan cek foreign key saat bank/kategori dihapus
+Index("ix_transactions_bank_date", Transaction.bank_id, Transaction.date)
+Index("ix_transactions_category_id", Transaction.category_id)
+
 # Model untuk create request (tanpa user_id)
 class TransactionCreate(TransactionBase):
     pass
@@ -33,9 +64,39 @@ class TransactionRead(TransactionBase, TimestampResponseMixin):
     id: int
     user_id: int  # Include in response
 
+# Dipakai GET /transactions?expand=category,bank
+class TransactionReadExpanded(TransactionRead):
+    category: Optional[CategoryRead] = None
+    bank: Optional[BankRead] = None
+
 class TransactionUpdate(SQLModel):
-    date: Optional[date] = None
+    # dt.date karena nama field `date` menutupi tipe `date` di dalam class ini
+    date: Optional[dt.date] = None
     amount: Optional[int] = None
     description: Optional[str] = None
     category_id: Optional[int] = None
-    bank_id: Optional[int] = None
\ No newline at end of file
+    bank_id: Optional[int] = None
+
+class SummaryInterval(str, Enum):
+    day = "day"
+    week = "week"
+    month = "month"
+
+# Total per grup, expense bernilai positif dan net = income - expense
+class TransactionSummary(SQLModel):
+    income: int
+    expense: int
+    net: int
+    count: int
+
+class PeriodSummary(TransactionSummary):
+    period: date
+
+class CategorySummary(TransactionSummary):
+    category_id: int
+    category_name: str
+    is_income: bool
+
+class BankSummary(TransactionSummary):
+    bank_id: int
+    bank_name: str
@@ -1,20 +1,37 @@
 from datetime import datetime
 from typing import Optional, List
 from sqlmodel import SQLModel, Field, Relationship
+from pydantic import validator
 from app.models.base import TimestampModel
 from app.schemas.base import TimestampResponseMixin
+from app.core.utils import get_timezone
 
 class UserBase(SQLModel):
     fullname: str = Field(max_length=100)
     username: str = Field(max_length=50)
     email: str = Field(max_length=50)
     is_active: bool = Field(default=True)
+    # Nama IANA (mis. "Asia/Jakarta"), None berarti settings.TIMEZONE
+    timezone: Optional[str] = Field(default=None, max_length=64)
+
+    @validator('timezone')
+    def check_timezone(cls, v):
+        if v is not None:
+            get_timezone(v)
+        return v
 
 class User(UserBase, TimestampModel, table=True):
     __tablename__ = "users"
     
     id: Optional[int] = Field(default=None, primary_key=True)
     password: str = Field(max_length=255)
+    # Dinaikkan saat password berubah atau user dinonaktifkan, token lama jadi invalid
+    token_version: int = Field(default=0)
+    # Akses ke endpoint /api/v1/admin, hanya bisa di-set langsung di database
+    is_superuser: bool = Field(default=False)
+    # Naik di setiap write ke transaksi user ini, validator ETag daftar transaksi
+    transactions_version: int = Field(default=0)
+    transactions_updated_at: Optional[datetime] = Field(default=None)
     
     # Add relationships
     categories: List["Category"] = Relationship(back_populates="user")
@@ -32,4 +49,11 @@ class UserUpdate(SQLModel):
     username: Optional[str] = None
     email: Optional[str] = None
     password: Optional[str] = None
-    is_active: Optional[bool] = None
\ No newline at end of file
+    is_active: Optional[bool] = None
+    timezone: Optional[str] = None
+
+    @validator('timezone')
+    def check_timezone(cls, v):
+        if v is not None:
+            get_timezone(v)
+        return v
\ No newline at end of file
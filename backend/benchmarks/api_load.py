@@ -0,0 +1,278 @@
+"""
+Load test for the API: concurrent async clients against a running server,
+reporting p50/p95/p99 latency and throughput per endpoint.
+
+Seed a scratch database (never point this at real data), start the server
+on it, then run the suite. Results are written as JSON so two commits can
+be compared:
+
+    python -m benchmarks.api_load seed --database-url sqlite:///./bench.db --users 1000 --transactions 10000000
+    DATABASE_URL=sqlite:///./bench.db uvicorn main:app --workers 4
+    python -m benchmarks.api_load run --requests 2000 --concurrency 50 --output benchmarks/results/after.json
+    python -m benchmarks.api_load run --compare benchmarks/results/before.json
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from sqlalchemy import create_engine
+from app.core.utils import get_utc_now
+from app.db.migrations import upgrade
+from app.db.seed import count_seeded_users, seed_database
+
+USERNAME_PREFIX = "load_"
+PASSWORD = "load-test-password"
+FIRST_DAY = date(2020, 1, 1)
+DAYS = 5 * 365
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="API load test and benchmark suite")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed_parser = commands.add_parser("seed", help="Fill a scratch database with load-test data")
+    seed_parser.add_argument("--database-url", required=True, help="Scratch database, it will be seeded")
+    seed_parser.add_argument("--users", type=int, default=1000)
+    seed_parser.add_argument("--transactions", type=int, default=1_000_000)
+    seed_parser.add_argument("--seed", type=int, default=42)
+
+    run_parser = commands.add_parser("run", help="Drive a running server and report latencies")
+    run_parser.add_argument("--base-url", default="http://localhost:8000/api/v1", help="API base URL")
+    run_parser.add_argument("--requests", type=int, default=1000, help="Measured requests per endpoint")
+    run_parser.add_argument("--concurrency", type=int, default=50, help="Concurrent clients")
+    run_parser.add_argument("--warmup", type=int, default=50, help="Unmeasured requests per endpoint")
+    run_parser.add_argument("--accounts", type=int, default=50, help="Seeded users to log in and spread load over")
+    run_parser.add_argument("--only", help="Comma separated endpoint names to run (default: all)")
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument("--output", help="JSON result file (default: benchmarks/results/<commit>.json)")
+    run_parser.add_argument("--compare", help="Earlier JSON result to print the difference against")
+    return parser.parse_args()
+
+# ---------------------------------------------------------------- seeding
+
+def seed(database_url: str, users: int, transactions: int, seed: int):
+    """Create users, banks, categories and transactions, unless a previous run already did"""
+    engine = create_engine(database_url)
+    upgrade(engine)
+    existing = count_seeded_users(engine, USERNAME_PREFIX)
+    if existing:
+        print(f"Reusing {existing} seeded users")
+        return
+    report = seed_database(
+        engine, users, transactions, first_day=FIRST_DAY, days=DAYS,
+        seed=seed, prefix=USERNAME_PREFIX, password=PASSWORD
+    )
+    print(f"Seeded {report}")
+
+# ---------------------------------------------------------------- load
+
+class Account:
+    def __init__(self, username: str, headers: dict, bank_ids: list, category_ids: list):
+        self.username = username
+        self.headers = headers
+        self.bank_ids = bank_ids
+        self.category_ids = category_ids
+
+def endpoints(rng: random.Random, accounts: list) -> dict:
+    """Endpoint name -> factory returning (method, path, request options) for one request"""
+    def account():
+        return rng.choice(accounts)
+
+    def login():
+        return "POST", "/login", {"data": {"username": account().username, "password": PASSWORD}}
+
+    def banks():
+        return "GET", "/banks/", {"headers": account().headers}
+
+    def categories():
+        return "GET", "/categories/", {"headers": account().headers}
+
+    def transactions_page():
+        return "GET", "/transactions/", {"headers": account().headers, "params": {"limit": 100}}
+
+    def transactions_filtered():
+        user = account()
+        month = FIRST_DAY + timedelta(days=rng.randrange(DAYS))
+        return "GET", "/transactions/", {"headers": user.headers, "params": {
+            "limit": 100,
+            "bank_id": rng.choice(user.bank_ids),
+            "start_date": month.replace(day=1).isoformat(),
+            "end_date": (month.replace(day=1) + timedelta(days=31)).replace(day=1).isoformat(),
+        }}
+
+    def transactions_expanded():
+        return "GET", "/transactions/", {"headers": account().headers, "params": {
+            "limit": 100, "expand": "category,bank"
+        }}
+
+    def summary_categories():
+        year = FIRST_DAY.year + rng.randrange(DAYS // 365)
+        return "GET", "/transactions/summary/categories", {"headers": account().headers, "params": {
+            "start_date": f"{year}-01-01", "end_date": f"{year}-12-31"
+        }}
+
+    def transactions_create():
+        user = account()
+        return "POST", "/transactions/", {"headers": user.headers, "json": {
+            "date": (FIRST_DAY + timedelta(days=rng.randrange(DAYS))).isoformat(),
+            "amount": rng.randint(1_000, 100_000),
+            "description": "load test",
+            "category_id": rng.choice(user.category_ids),
+            "bank_id": rng.choice(user.bank_ids),
+        }}
+
+    # Urutan tetap: baca dulu, tulis terakhir supaya hasil baca antar run sebanding
+    return {
+        "auth.login": login,
+        "banks.list": banks,
+        "categories.list": categories,
+        "transactions.list": transactions_page,
+        "transactions.list_filtered": transactions_filtered,
+        "transactions.list_expanded": transactions_expanded,
+        "transactions.summary_categories": summary_categories,
+        "transactions.create": transactions_create,
+    }
+
+async def login_accounts(client, count: int) -> list:
+    """Log in the first `count` seeded users and look up their banks and categories"""
+    accounts = []
+    for n in range(count):
+        username = f"{USERNAME_PREFIX}{n}"
+        response = await client.post("/login", data={"username": username, "password": PASSWORD})
+        if response.status_code != 200:
+            raise SystemExit(f"Login failed for {username} ({response.status_code}); seed the database first")
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        banks = (await client.get("/banks/", headers=headers)).json()
+        categories = (await client.get("/categories/", headers=headers)).json()
+        accounts.append(Account(
+            username, headers, [bank["id"] for bank in banks], [category["id"] for category in categories]
+        ))
+    return accounts
+
+async def drive(client, factory, total: int, concurrency: int) -> dict:
+    """Send `total` requests from `concurrency` clients, returns latencies and error counts"""
+    latencies = []
+    statuses = {}
+    remaining = iter(range(total))
+
+    async def worker():
+        for _ in remaining:
+            method, path, options = factory()
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path, **options)
+                status = response.status_code
+            except Exception as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return {"latencies": latencies, "statuses": statuses, "elapsed": time.perf_counter() - started}
+
+def summarize(measured: dict) -> dict:
+    latencies = sorted(measured["latencies"])
+    percentiles = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+    errors = sum(count for status, count in measured["statuses"].items() if not (isinstance(status, int) and status < 400))
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "statuses": {str(status): count for status, count in sorted(measured["statuses"].items(), key=str)},
+        "throughput_rps": round(len(latencies) / measured["elapsed"], 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+        "p50_ms": round(percentiles[49] * 1000, 2),
+        "p95_ms": round(percentiles[94] * 1000, 2),
+        "p99_ms": round(percentiles[98] * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2),
+    }
+
+async def run(args) -> dict:
+    import httpx
+
+    rng = random.Random(args.seed)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60) as client:
+        accounts = await login_accounts(client, args.accounts)
+        selected = set(args.only.split(",")) if args.only else None
+        results = {}
+        for name, factory in endpoints(rng, accounts).items():
+            if selected is not None and name not in selected:
+                continue
+            if args.warmup:
+                await drive(client, factory, args.warmup, args.concurrency)
+            results[name] = summarize(await drive(client, factory, args.requests, args.concurrency))
+            print_row(name, results[name])
+    return results
+
+# ---------------------------------------------------------------- report
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def print_header():
+    print(f"{'endpoint':<34} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+
+def print_row(name: str, result: dict):
+    print(
+        f"{name:<34} {result['throughput_rps']:>9.1f} {result['p50_ms']:>9.2f} "
+        f"{result['p95_ms']:>9.2f} {result['p99_ms']:>9.2f} {result['errors']:>7}"
+    )
+
+def print_comparison(baseline: dict, current: dict):
+    print(f"\nCompared with {baseline['meta']['commit']} (negative latency / positive req/s is better)")
+    print(f"{'endpoint':<34} {'req/s':>9} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+
+        def change(key):
+            return f"{(result[key] - before[key]) / before[key] * 100:+.1f}%" if before[key] else "n/a"
+
+        print(f"{name:<34} {change('throughput_rps'):>9} {change('p50_ms'):>9} {change('p95_ms'):>9} {change('p99_ms'):>9}")
+
+def main():
+    args = parse_arguments()
+    if args.command == "seed":
+        seed(args.database_url, args.users, args.transactions, args.seed)
+        return
+
+    started_at = get_utc_now()
+    print_header()
+    results = asyncio.run(run(args))
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "started_at": started_at.isoformat(),
+            "base_url": args.base_url,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "warmup": args.warmup,
+            "accounts": args.accounts,
+            "seed": args.seed,
+            "python": platform.python_version(),
+        },
+        "results": results,
+    }
+
+    output = Path(args.output or Path(__file__).parent / "results" / f"{report['meta']['commit']}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nSaved {output}")
+
+    if args.compare:
+        print_comparison(json.loads(Path(args.compare).read_text()), report)
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,7 @@
 # backend/init_db.py
 import logging
-from sqlmodel import SQLModel
 from app.db.session import engine
-from app.models.user import User
-from app.models.bank import Bank
-from app.models.category import Category
-from app.models.transaction import Transaction
+from app.db.migrations import current_version, upgrade
 from app.core.config import settings
 
 # Setup logging
@@ -13,24 +9,13 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 def init_database():
-    logger.info("Creating database tables...")
+    logger.info("Applying database migrations...")
     try:
-        SQLModel.metadata.drop_all(engine)
-        logger.info("Dropped all existing tables")
-        
-        SQLModel.metadata.create_all(engine)
-        logger.info("Successfully created all tables")
-        
-        logger.info("""
-Tables created:
-- users
-- banks
-- categories
-- transactions
-        """)
-        
+        before = current_version(engine)
+        after = upgrade(engine)
+        logger.info(f"Schema version {before} -> {after}, existing data kept")
     except Exception as e:
-        logger.error(f"Error creating database tables: {e}")
+        logger.error(f"Error initializing database: {e}")
         raise e
 
 def main():
@@ -40,4 +25,4 @@ def main():
     logger.info("Database initialization completed!")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
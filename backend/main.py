@@ -1,7 +1,13 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.db.session import init_db
-from app.api.v1 import auth, users, banks, categories, transactions
+from app.db.session import engine
+from app.db.migrations import check_schema_version
+from app.core.config import settings
+from app.core.responses import LocalTimeJSONResponse
+from app.core.timing import RequestTimingMiddleware, label_router
+from app.api import prometheus
+from app.api.v1 import auth, users, banks, categories, transactions, metrics, admin
 import pyfiglet
 import logging
 
@@ -14,10 +20,18 @@ ascii_banner = pyfiglet.figlet_format("FLOO API", font="slant")
 print("\n\033[92m" + ascii_banner + "\033[0m")  # \033[92m untuk warna hijau, \033[0m untuk reset warna
 print("\033[94m=== Financial Logger/Organizer Online ===\033[0m\n")  # \033[94m untuk warna biru
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup hanya mengecek versi schema, migrasi dijalankan lewat `python -m app.db.migrations upgrade`
+    check_schema_version(engine)
+    yield
+
 app = FastAPI(
     title="FLOO API",
     description="Financial Logger/Organizer Online API",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=LocalTimeJSONResponse,
+    lifespan=lifespan
 )
 
 # CORS middleware configuration
@@ -32,14 +46,29 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "X-Cache", "Server-Timing"],
 )
 
-# Include routers
-app.include_router(auth, prefix="/api/v1", tags=["auth"])
-app.include_router(users, prefix="/api/v1/users", tags=["users"])
-app.include_router(banks, prefix="/api/v1/banks", tags=["banks"])
-app.include_router(categories, prefix="/api/v1/categories", tags=["categories"])
-app.include_router(transactions, prefix="/api/v1/transactions", tags=["transactions"])
+# Paling luar supaya waktu middleware lain ikut terukur
+app.add_middleware(RequestTimingMiddleware)
+
+# Include routers; tag juga dipakai sebagai label router di /metrics
+for router, prefix, tag in [
+    (auth, "/api/v1", "auth"),
+    (users, "/api/v1/users", "users"),
+    (banks, "/api/v1/banks", "banks"),
+    (categories, "/api/v1/categories", "categories"),
+    (transactions, "/api/v1/transactions", "transactions"),
+    (metrics, "/api/v1/metrics", "metrics"),
+    (admin, "/api/v1/admin", "admin"),
+]:
+    app.include_router(router, prefix=prefix, tags=[tag])
+    label_router(router, tag)
+
+# Prometheus scrape endpoint di /metrics, hanya jika diaktifkan
+if settings.PROMETHEUS_METRICS:
+    app.include_router(prometheus.router)
+    label_router(prometheus.router, "metrics")
 
 @app.get("/")
 async def root():
@@ -0,0 +1,123 @@
+"""
+In-process test harness: main.app is driven through httpx's ASGITransport
+against a throwaway SQLite database, one per pytest-xdist worker.
+
+    pytest            # parallel, see pytest.ini
+    pytest -n 0 -k banks
+"""
+import os
+import tempfile
+
+# Harus sebelum import app: engine dan settings dibuat saat import
+_worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+DATABASE_PATH = os.path.join(tempfile.gettempdir(), f"floo_test_{os.getpid()}_{_worker}.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DATABASE_PATH}"
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ["BCRYPT_ROUNDS"] = "4"  # Minimum bcrypt, cukup untuk test
+os.environ["CACHE_BACKEND"] = "memory"
+os.environ["PROMETHEUS_METRICS"] = "true"
+
+import itertools
+import httpx
+import pytest
+from sqlmodel import Session, update
+from app.db.migrations import upgrade
+from app.db.session import async_engine, engine
+from app.models.user import User
+from main import app
+
+PASSWORD = "password123"
+_usernames = itertools.count()
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    if os.path.exists(DATABASE_PATH):
+        os.remove(DATABASE_PATH)
+    upgrade(engine)
+    yield engine
+    engine.dispose()
+    os.remove(DATABASE_PATH)
+
+@pytest.fixture(scope="session")
+async def client(database):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test/api/v1") as client:
+        yield client
+    await async_engine.dispose()
+
+async def create_user(client: httpx.AsyncClient, **fields) -> dict:
+    """Register and log in a fresh user, returns its data plus auth headers"""
+    username = fields.pop("username", f"user_{_worker}_{next(_usernames)}")
+    response = await client.post("/register", json={
+        "fullname": "Test User",
+        "username": username,
+        "email": f"{username}@example.com",
+        "password": PASSWORD,
+        **fields
+    })
+    assert response.status_code == 200, response.text
+    response = await client.post("/login", data={"username": username, "password": PASSWORD})
+    assert response.status_code == 200, response.text
+    return {
+        **(await client.get("/users/me", headers=_bearer(response))).json(),
+        "headers": _bearer(response)
+    }
+
+def _bearer(login_response: httpx.Response) -> dict:
+    return {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+async def create_account(client: httpx.AsyncClient, user: dict, transactions: int = 0) -> dict:
+    """One bank with an income and an expense category, plus optional transactions"""
+    headers = user["headers"]
+    bank = (await client.post("/banks/", headers=headers, json={
+        "name": "Main Bank", "color": "#0000ff", "start_balance": 1_000_000
+    })).json()
+    income = (await client.post("/categories/", headers=headers, json={
+        "name": "Salary", "is_income": True
+    })).json()
+    expense = (await client.post("/categories/", headers=headers, json={
+        "name": "Food", "is_income": False
+    })).json()
+
+    rows = [
+        {
+            "date": f"2024-{n % 12 + 1:02d}-{n % 28 + 1:02d}",
+            "amount": 1_000 * (n + 1),
+            "description": f"Transaction {n}",
+            "category_id": (income if n % 3 == 0 else expense)["id"],
+            "bank_id": bank["id"]
+        }
+        for n in range(transactions)
+    ]
+    if rows:
+        response = await client.post("/transactions/bulk", headers=headers, json=rows)
+        assert response.status_code == 200, response.text
+
+    return {"user": user, "headers": headers, "bank": bank, "income": income, "expense": expense, "rows": rows}
+
+@pytest.fixture
+async def user(client):
+    """A fresh user per test, for tests that change data"""
+    return await create_user(client)
+
+@pytest.fixture
+async def superuser(client):
+    user = await create_user(client)
+    with Session(engine) as session:
+        session.exec(update(User).where(User.id == user["id"]).values(is_superuser=True))
+        session.commit()
+    return user
+
+@pytest.fixture
+async def account(client, user):
+    """A fresh user with one bank and two categories, without transactions"""
+    return await create_account(client, user)
+
+@pytest.fixture(scope="session")
+async def seeded(client):
+    """Shared read-only account with 50 transactions; tests must not modify it"""
+    return await create_account(client, await create_user(client), transactions=50)
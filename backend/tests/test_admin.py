@@ -0,0 +1,25 @@
+import pytest
+from sqlmodel import Session, update
+from app.db.session import engine
+from app.models.bank import Bank
+from app.models.user import User
+
+pytestmark = pytest.mark.anyio
+
+async def test_reconcile_requires_superuser(client, user):
+    response = await client.post("/admin/reconcile-balances", headers=user["headers"])
+    assert response.status_code == 403
+
+async def test_reconcile_fixes_drift(client, account):
+    with Session(engine) as session:
+        session.exec(update(User).where(User.id == account["user"]["id"]).values(is_superuser=True))
+        session.exec(update(Bank).where(Bank.id == account["bank"]["id"]).values(end_balance=1))
+        session.commit()
+
+    params = {"user_id": account["user"]["id"]}
+    response = await client.post("/admin/reconcile-balances", headers=account["headers"], params=params)
+    assert response.status_code == 200
+    assert response.json()["banks_drifted"] == 1
+
+    bank = await client.get(f"/banks/{account['bank']['id']}", headers=account["headers"])
+    assert bank.json()["end_balance"] == 1_000_000
@@ -0,0 +1,109 @@
+import json
+from pathlib import Path
+import pytest
+from sqlmodel import Session, update
+from app.api.deps import user_cache
+from app.core.config import settings
+from app.db.session import engine
+from app.models.user import User
+from tests.conftest import PASSWORD, create_user
+
+pytestmark = pytest.mark.anyio
+
+TEST_DATA = json.loads((Path(__file__).parent / "test_data.json").read_text())
+
+async def test_register_multiple_users(client):
+    # Setiap worker punya database sendiri, jadi data tetap bisa dipakai saat paralel
+    for user_data in TEST_DATA["user"]["register_multiple"]:
+        response = await client.post("/register", json=user_data)
+        assert response.status_code == 200, response.text
+        body = response.json()
+        assert body["username"] == user_data["username"]
+        assert "password" not in body
+
+async def test_register_duplicate_username(client, user):
+    response = await client.post("/register", json={
+        "fullname": "Copy", "username": user["username"],
+        "email": "another@example.com", "password": PASSWORD
+    })
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Username already registered"
+
+async def test_register_rejects_unknown_timezone(client):
+    response = await client.post("/register", json={
+        "fullname": "Nowhere", "username": "nowhere", "email": "nowhere@example.com",
+        "password": PASSWORD, "timezone": "Mars/Olympus"
+    })
+    assert response.status_code == 422
+
+@pytest.mark.parametrize("timezone", ["inf", "-inf", "nan", "1e300", "24", "-24"])
+async def test_register_rejects_out_of_range_offset(client, timezone):
+    response = await client.post("/register", json={
+        "fullname": "Nowhere", "username": "offset", "email": "offset@example.com",
+        "password": PASSWORD, "timezone": timezone
+    })
+    assert response.status_code == 422
+
+async def test_update_rejects_out_of_range_offset(client, user):
+    response = await client.patch("/users/me", headers=user["headers"], json={"timezone": "1e300"})
+    assert response.status_code == 422
+    response = await client.patch("/users/me", headers=user["headers"], json={"timezone": "-3.5"})
+    assert response.status_code == 200
+
+async def test_login(client, user):
+    response = await client.post("/login", data={"username": user["username"], "password": PASSWORD})
+    assert response.status_code == 200
+    assert response.json()["token_type"] == "bearer"
+
+async def test_login_wrong_password(client, user):
+    response = await client.post("/login", data={"username": user["username"], "password": "wrong"})
+    assert response.status_code == 401
+
+async def test_me_requires_token(client):
+    assert (await client.get("/users/me")).status_code == 401
+    response = await client.get("/users/me", headers={"Authorization": "Bearer not-a-token"})
+    assert response.status_code == 401
+
+async def test_password_change_revokes_old_tokens(client, user):
+    response = await client.patch("/users/me", headers=user["headers"], json={"password": "new-password"})
+    assert response.status_code == 200
+    assert (await client.get("/users/me", headers=user["headers"])).status_code == 401
+
+async def test_timezone_changes_local_times(client):
+    user = await create_user(client, timezone="UTC")
+    jakarta = await client.patch("/users/me", headers=user["headers"], json={"timezone": "Asia/Jakarta"})
+    assert jakarta.status_code == 200
+    assert user["created_at"].endswith("+00:00")
+    assert jakarta.json()["created_at"].endswith("+07:00")
+
+async def test_stateless_stale_snapshot_defers_to_database(client, user, monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_MODE", "stateless")
+    old_headers = user["headers"]
+    assert (await client.get("/users/me", headers=old_headers)).status_code == 200
+
+    # Token version naik di worker lain: snapshot di worker ini tidak ikut diinvalidasi
+    with Session(engine) as session:
+        session.exec(update(User).where(User.id == user["id"]).values(token_version=User.token_version + 1))
+        session.commit()
+    login = await client.post("/login", data={"username": user["username"], "password": PASSWORD})
+    new_headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    assert user_cache.get(user["id"]) is not None
+
+    assert (await client.get("/users/me", headers=new_headers)).status_code == 200
+    assert (await client.get("/users/me", headers=old_headers)).status_code == 401
+
+async def test_stateless_password_change_advances_stale_token_version(client, user, monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_MODE", "stateless")
+    old_headers = user["headers"]
+    assert (await client.get("/users/me", headers=old_headers)).status_code == 200
+
+    # Password diganti di worker lain: snapshot di worker ini masih token_version lama
+    with Session(engine) as session:
+        session.exec(update(User).where(User.id == user["id"]).values(token_version=User.token_version + 1))
+        session.commit()
+    login = await client.post("/login", data={"username": user["username"], "password": PASSWORD})
+    between_headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    response = await client.patch("/users/me", headers=old_headers, json={"password": "new-password"})
+    assert response.status_code == 200
+    assert (await client.get("/users/me", headers=between_headers)).status_code == 401
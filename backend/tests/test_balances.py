@@ -0,0 +1,64 @@
+"""
+Concurrent creates, updates and deletes against one bank: end_balance must
+equal start_balance plus the signed sum of the transactions that remain.
+The requests interleave at every await, which is where a read-modify-write
+balance update would lose changes.
+"""
+import asyncio
+import random
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+CREATES = 200  # Create paralel, lalu sepertiganya di-update dan seperenamnya di-delete
+
+async def test_concurrent_writes_keep_end_balance(client, account):
+    rng = random.Random(14)
+    headers = account["headers"]
+    income_id, expense_id = account["income"]["id"], account["expense"]["id"]
+
+    async def create(n):
+        response = await client.post("/transactions/", headers=headers, json={
+            "date": f"2025-01-{n % 28 + 1:02d}",
+            "amount": rng.randint(1, 10_000),
+            "description": f"concurrent #{n}",
+            "category_id": rng.choice([income_id, expense_id]),
+            "bank_id": account["bank"]["id"]
+        })
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    async def update(transaction):
+        # Balik income <-> expense dan ubah nominal
+        response = await client.patch(f"/transactions/{transaction['id']}", headers=headers, json={
+            "amount": transaction["amount"] + 1,
+            "category_id": expense_id if transaction["category_id"] == income_id else income_id
+        })
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    async def delete(transaction):
+        response = await client.delete(f"/transactions/{transaction['id']}", headers=headers)
+        assert response.status_code == 200, response.text
+
+    remaining = {row["id"]: row for row in await asyncio.gather(*(create(n) for n in range(CREATES)))}
+    ids = list(remaining)
+    rng.shuffle(ids)
+    to_delete, to_update = ids[:CREATES // 6], ids[CREATES // 6:CREATES // 2]
+
+    # Update dan delete berjalan bersamaan, pada transaksi yang berbeda
+    results = await asyncio.gather(
+        *(update(remaining[i]) for i in to_update),
+        *(delete(remaining[i]) for i in to_delete)
+    )
+    for row in results[:len(to_update)]:
+        remaining[row["id"]] = row
+    for transaction_id in to_delete:
+        remaining.pop(transaction_id)
+
+    expected = account["bank"]["start_balance"] + sum(
+        row["amount"] if row["category_id"] == income_id else -row["amount"]
+        for row in remaining.values()
+    )
+    bank = await client.get(f"/banks/{account['bank']['id']}", headers=headers)
+    assert bank.json()["end_balance"] == expected
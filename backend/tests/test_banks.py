@@ -0,0 +1,116 @@
+import pytest
+from sqlalchemy import update
+from app.core.utils import get_utc_now
+from app.db.balances import balance_history_cache
+from app.models.bank import Bank
+from tests.conftest import create_user
+
+pytestmark = pytest.mark.anyio
+
+async def test_create_bank_sets_end_balance(client, user):
+    response = await client.post("/banks/", headers=user["headers"], json={
+        "name": "Savings", "color": "#00ff00", "start_balance": 250_000
+    })
+    assert response.status_code == 200
+    assert response.json()["end_balance"] == 250_000
+
+async def test_bank_list_cache_is_invalidated_by_writes(client, account):
+    headers = account["headers"]
+    first = await client.get("/banks/", headers=headers)
+    assert first.headers["X-Cache"] == "MISS"
+    assert (await client.get("/banks/", headers=headers)).headers["X-Cache"] == "HIT"
+
+    await client.post("/banks/", headers=headers, json={"name": "Second", "color": "#ffffff"})
+    after = await client.get("/banks/", headers=headers)
+    assert after.headers["X-Cache"] == "MISS"
+    assert len(after.json()) == len(first.json()) + 1
+
+async def test_bank_list_cache_sees_writes_from_other_processes(client, account, database):
+    headers = account["headers"]
+    await client.get("/banks/", headers=headers)
+    assert (await client.get("/banks/", headers=headers)).headers["X-Cache"] == "HIT"
+
+    # Seperti worker lain atau CLI reconcile: langsung ke database, tanpa lewat cache ini
+    with database.begin() as connection:
+        connection.execute(
+            update(Bank).where(Bank.id == account["bank"]["id"])
+            .values(end_balance=123, updated_at=get_utc_now())
+        )
+    response = await client.get("/banks/", headers=headers)
+    assert response.headers["X-Cache"] == "MISS"
+    assert response.json()[0]["end_balance"] == 123
+
+async def test_bank_list_conditional_get(client, account):
+    headers = account["headers"]
+    first = await client.get("/banks/", headers=headers)
+    etag = first.headers["ETag"]
+
+    response = await client.get("/banks/", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+    await client.patch(f"/banks/{account['bank']['id']}", headers=headers, json={"name": "Renamed"})
+    response = await client.get("/banks/", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+async def test_banks_are_private(client, seeded):
+    other = await create_user(client)
+    assert (await client.get("/banks/", headers=other["headers"])).json() == []
+    response = await client.get(f"/banks/{seeded['bank']['id']}", headers=other["headers"])
+    assert response.status_code == 403
+
+async def test_balance_history_ends_at_end_balance(client, account):
+    headers = account["headers"]
+    bank_id = account["bank"]["id"]
+    await client.post("/transactions/", headers=headers, json={
+        "date": "2024-03-01", "amount": 40_000, "description": "Lunch",
+        "category_id": account["expense"]["id"], "bank_id": bank_id
+    })
+    response = await client.get(f"/banks/{bank_id}/balance-history", headers=headers, params={
+        "start_date": "2024-02-28", "end_date": "2024-03-02"
+    })
+    assert response.status_code == 200
+    balances = [point["balance"] for point in response.json()]
+    assert balances == [1_000_000, 1_000_000, 960_000, 960_000]
+
+async def test_balance_history_follows_date_only_edits(client, account):
+    headers = account["headers"]
+    bank_id = account["bank"]["id"]
+    created = await client.post("/transactions/", headers=headers, json={
+        "date": "2024-03-01", "amount": 40_000, "description": "Lunch",
+        "category_id": account["expense"]["id"], "bank_id": bank_id
+    })
+    params = {"start_date": "2024-02-28", "end_date": "2024-03-02"}
+    before = await client.get(f"/banks/{bank_id}/balance-history", headers=headers, params=params)
+    assert [point["balance"] for point in before.json()] == [1_000_000, 1_000_000, 960_000, 960_000]
+
+    await client.patch(f"/transactions/{created.json()['id']}", headers=headers, json={"date": "2024-03-02"})
+    after = await client.get(f"/banks/{bank_id}/balance-history", headers=headers, params=params)
+    assert [point["balance"] for point in after.json()] == [1_000_000, 1_000_000, 1_000_000, 960_000]
+
+async def test_balance_history_follows_category_sign_flip(client, account):
+    headers = account["headers"]
+    bank_id = account["bank"]["id"]
+    await client.post("/transactions/", headers=headers, json={
+        "date": "2024-03-01", "amount": 40_000, "description": "Refund",
+        "category_id": account["expense"]["id"], "bank_id": bank_id
+    })
+    params = {"start_date": "2024-02-29", "end_date": "2024-03-01"}
+    before = await client.get(f"/banks/{bank_id}/balance-history", headers=headers, params=params)
+    assert [point["balance"] for point in before.json()] == [1_000_000, 960_000]
+
+    await client.patch(f"/categories/{account['expense']['id']}", headers=headers, json={"is_income": True})
+    after = await client.get(f"/banks/{bank_id}/balance-history", headers=headers, params=params)
+    assert [point["balance"] for point in after.json()] == [1_000_000, 1_040_000]
+
+async def test_balance_history_cache_is_bounded_by_bytes(client, account, monkeypatch):
+    headers = account["headers"]
+    bank_id = account["bank"]["id"]
+    monkeypatch.setattr(balance_history_cache, "max_weight", balance_history_cache.weight + 50_000)
+
+    long_range = {"start_date": "2015-01-01", "end_date": "2024-12-31"}
+    response = await client.get(f"/banks/{bank_id}/balance-history", headers=headers, params=long_range)
+    assert response.status_code == 200
+    assert len(response.json()) > 3000
+    assert balance_history_cache.weight <= balance_history_cache.max_weight
@@ -0,0 +1,28 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+async def test_category_crud(client, user):
+    headers = user["headers"]
+    created = await client.post("/categories/", headers=headers, json={"name": "Rent", "is_income": False})
+    assert created.status_code == 200
+    category_id = created.json()["id"]
+
+    updated = await client.patch(f"/categories/{category_id}", headers=headers, json={"name": "Housing"})
+    assert updated.status_code == 200
+    assert updated.json()["name"] == "Housing"
+
+    listed = await client.get("/categories/", headers=headers)
+    assert [category["name"] for category in listed.json()] == ["Housing"]
+
+    assert (await client.delete(f"/categories/{category_id}", headers=headers)).status_code == 200
+    assert (await client.get(f"/categories/{category_id}", headers=headers)).status_code == 404
+
+async def test_category_list_cache(client, account):
+    headers = account["headers"]
+    assert (await client.get("/categories/", headers=headers)).headers["X-Cache"] == "MISS"
+    assert (await client.get("/categories/", headers=headers)).headers["X-Cache"] == "HIT"
+    await client.post("/categories/", headers=headers, json={"name": "Bonus", "is_income": True})
+    response = await client.get("/categories/", headers=headers)
+    assert response.headers["X-Cache"] == "MISS"
+    assert len(response.json()) == 3
@@ -0,0 +1,44 @@
+import logging
+import pytest
+from app.core.config import settings
+
+pytestmark = pytest.mark.anyio
+
+async def test_server_timing_header(client, seeded):
+    response = await client.get("/transactions/", headers=seeded["headers"], params={"expand": "bank"})
+    timing = response.headers["Server-Timing"]
+    assert timing.startswith("app;dur=")
+    assert "db;dur=" in timing
+    # Minimal query user + validator ETag + daftar transaksi
+    queries = int(timing.split('desc="')[1].split(" queries")[0])
+    assert queries >= 3
+
+async def test_pool_metrics_require_superuser(client, user, superuser):
+    assert (await client.get("/metrics/pool")).status_code == 401
+    assert (await client.get("/metrics/pool", headers=user["headers"])).status_code == 403
+    response = await client.get("/metrics/pool", headers=superuser["headers"])
+    assert response.status_code == 200
+    assert "checked_out" in response.json()["async"]
+
+async def test_hashing_metrics_require_superuser(client, user, superuser):
+    assert (await client.get("/metrics/hashing", headers=user["headers"])).status_code == 403
+    response = await client.get("/metrics/hashing", headers=superuser["headers"])
+    assert response.status_code == 200
+    assert "queue_depth" in response.json()
+
+async def test_request_metrics_per_route(client, seeded, user, superuser):
+    for bank_id in (seeded["bank"]["id"], seeded["bank"]["id"] + 100_000):
+        await client.get(f"/banks/{bank_id}", headers=seeded["headers"])
+
+    assert (await client.get("/metrics/requests", headers=user["headers"])).status_code == 403
+    routes = (await client.get("/metrics/requests", headers=superuser["headers"])).json()
+    bank = routes["GET /api/v1/banks/{bank_id}"]
+    assert bank["requests"] >= 2
+    assert bank["statements_total"] >= 2 * 2
+    assert bank["wall_avg_ms"] > 0
+
+async def test_slow_queries_are_logged(client, seeded, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 1e-6)
+    with caplog.at_level(logging.WARNING, logger="app.db.query_events"):
+        await client.get("/categories/", headers=seeded["headers"])
+    assert any("Slow query" in message and "params:" in message for message in caplog.messages)
@@ -0,0 +1,43 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+from main import app
+
+pytestmark = pytest.mark.anyio
+
+async def scrape() -> dict:
+    """Sample lines as {"name{labels}": value}"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    samples = {}
+    for line in response.text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+async def test_requests_are_counted_per_router(client, seeded):
+    before = await scrape()
+    for _ in range(3):
+        await client.get("/banks/", headers=seeded["headers"])
+    after = await scrape()
+
+    key = 'floo_http_requests_total{router="banks",method="GET",status="200"}'
+    assert after[key] - before.get(key, 0) == 3
+    count = 'floo_http_request_duration_seconds_count{router="banks"}'
+    assert after[count] - before.get(count, 0) == 3
+    assert after['floo_http_request_duration_seconds_bucket{router="banks",le="+Inf"}'] == after[count]
+
+async def test_auth_router_label(client, user):
+    samples = await scrape()
+    assert samples['floo_http_requests_total{router="auth",method="POST",status="200"}'] >= 2
+
+async def test_cache_pool_and_hashing_metrics(client, seeded):
+    await client.get("/categories/", headers=seeded["headers"])
+    await client.get("/categories/", headers=seeded["headers"])
+    samples = await scrape()
+    assert samples['floo_cache_requests_total{cache="categories",result="hit"}'] >= 1
+    assert 0 < samples['floo_cache_hit_ratio{cache="categories"}'] <= 1
+    assert 'floo_db_pool_connections{pool="async",state="checked_out"}' in samples
+    assert samples["floo_password_hash_queue_wait_seconds_count"] >= 1
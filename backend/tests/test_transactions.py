@@ -0,0 +1,302 @@
+import csv
+import importlib
+import io
+import json
+import pytest
+from app.core.config import settings
+from app.core.statements import parse_amount
+from tests.conftest import create_account, create_user
+
+pytestmark = pytest.mark.anyio
+
+def signed_total(account: dict) -> int:
+    return sum(
+        row["amount"] if row["category_id"] == account["income"]["id"] else -row["amount"]
+        for row in account["rows"]
+    )
+
+async def get_balance(client, account: dict) -> int:
+    response = await client.get(f"/banks/{account['bank']['id']}", headers=account["headers"])
+    return response.json()["end_balance"]
+
+async def test_bulk_create_updates_balance(client, seeded):
+    assert await get_balance(client, seeded) == 1_000_000 + signed_total(seeded)
+
+async def test_create_update_delete_keep_balance(client, account):
+    headers = account["headers"]
+    created = await client.post("/transactions/", headers=headers, json={
+        "date": "2024-05-01", "amount": 300_000, "description": "Salary",
+        "category_id": account["income"]["id"], "bank_id": account["bank"]["id"]
+    })
+    assert created.status_code == 200
+    transaction_id = created.json()["id"]
+    assert await get_balance(client, account) == 1_300_000
+
+    # Pindah ke kategori pengeluaran: +300k berubah menjadi -100k
+    updated = await client.patch(f"/transactions/{transaction_id}", headers=headers, json={
+        "amount": 100_000, "category_id": account["expense"]["id"]
+    })
+    assert updated.status_code == 200
+    assert await get_balance(client, account) == 900_000
+
+    assert (await client.delete(f"/transactions/{transaction_id}", headers=headers)).status_code == 200
+    assert await get_balance(client, account) == 1_000_000
+
+async def test_cursor_pagination_visits_every_row_once(client, seeded):
+    seen = []
+    params = {"limit": 7}
+    while True:
+        response = await client.get("/transactions/", headers=seeded["headers"], params=params)
+        assert response.status_code == 200
+        seen.extend((row["date"], row["id"]) for row in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        params = {"limit": 7, "cursor": cursor}
+
+    assert len(seen) == len(seeded["rows"])
+    assert len(set(seen)) == len(seen)
+    assert seen == sorted(seen, reverse=True)
+
+async def test_filters_and_expand(client, seeded):
+    response = await client.get("/transactions/", headers=seeded["headers"], params={
+        "category_id": seeded["income"]["id"],
+        "start_date": "2024-01-01",
+        "end_date": "2024-06-30",
+        "expand": "category,bank"
+    })
+    assert response.status_code == 200
+    rows = response.json()
+    expected = [
+        row for row in seeded["rows"]
+        if row["category_id"] == seeded["income"]["id"] and row["date"] <= "2024-06-30"
+    ]
+    assert len(rows) == len(expected)
+    assert all(row["category"]["is_income"] for row in rows)
+    assert all(row["bank"]["id"] == seeded["bank"]["id"] for row in rows)
+
+async def test_unknown_expand_is_rejected(client, seeded):
+    response = await client.get("/transactions/", headers=seeded["headers"], params={"expand": "user"})
+    assert response.status_code == 400
+
+async def test_transaction_list_conditional_get(client, seeded):
+    first = await client.get("/transactions/", headers=seeded["headers"])
+    response = await client.get("/transactions/", headers={
+        **seeded["headers"], "If-None-Match": first.headers["ETag"]
+    })
+    assert response.status_code == 304
+
+async def test_transaction_list_etag_follows_every_write(client, account):
+    headers = account["headers"]
+
+    async def etag():
+        return (await client.get("/transactions/", headers=headers, params={"limit": 1})).headers["ETag"]
+
+    seen = [await etag()]
+    created = await client.post("/transactions/", headers=headers, json={
+        "date": "2024-05-01", "amount": 1_000, "description": "Lunch",
+        "category_id": account["expense"]["id"], "bank_id": account["bank"]["id"]
+    })
+    seen.append(await etag())
+    # Hanya deskripsi: saldo dan rollup tetap, ETag tetap harus berubah
+    await client.patch(f"/transactions/{created.json()['id']}", headers=headers, json={"description": "Dinner"})
+    seen.append(await etag())
+    await client.delete(f"/transactions/{created.json()['id']}", headers=headers)
+    seen.append(await etag())
+    assert len(set(seen)) == len(seen)
+
+async def test_category_summary_matches_rows(client, seeded):
+    response = await client.get("/transactions/summary/categories", headers=seeded["headers"])
+    assert response.status_code == 200
+    totals = {row["category_id"]: row for row in response.json()}
+    income = totals[seeded["income"]["id"]]
+    expense = totals[seeded["expense"]["id"]]
+    assert income["income"] - expense["expense"] == signed_total(seeded)
+    assert income["count"] + expense["count"] == len(seeded["rows"])
+
+async def test_period_summary_rollups_match_raw_rows(client, seeded):
+    # Range bulan penuh memakai rollup, range sebagian membaca tabel transactions
+    headers = seeded["headers"]
+    full = await client.get("/transactions/summary/period", headers=headers, params={
+        "start_date": "2024-01-01", "end_date": "2024-12-31"
+    })
+    partial = await client.get("/transactions/summary/period", headers=headers, params={
+        "start_date": "2024-01-01", "end_date": "2024-12-30"
+    })
+    assert full.status_code == partial.status_code == 200
+    assert full.json() == partial.json()
+
+async def test_bulk_rejects_foreign_bank(client, account, seeded):
+    response = await client.post("/transactions/bulk", headers=account["headers"], json=[{
+        "date": "2024-01-01", "amount": 1, "description": "Not mine",
+        "category_id": account["expense"]["id"], "bank_id": seeded["bank"]["id"]
+    }])
+    assert response.status_code == 404
+
+async def test_create_rejects_foreign_bank_and_category(client, account):
+    other = await create_account(client, await create_user(client))
+    for bank, category in ((other["bank"], account["expense"]), (account["bank"], other["expense"])):
+        response = await client.post("/transactions/", headers=account["headers"], json={
+            "date": "2024-01-01", "amount": 1_000, "description": "Not mine",
+            "category_id": category["id"], "bank_id": bank["id"]
+        })
+        assert response.status_code == 404
+    assert await get_balance(client, other) == 1_000_000
+    assert await get_balance(client, account) == 1_000_000
+
+def statement_csv(rows: int) -> bytes:
+    lines = ["date,amount,description"]
+    lines += [f"2024-06-{n % 28 + 1:02d},-{1_000 * (n + 1)},Row {n}" for n in range(rows)]
+    return "\n".join(lines).encode()
+
+async def test_import_statement(client, account):
+    response = await client.post("/transactions/import", headers=account["headers"], data={
+        "bank_id": account["bank"]["id"], "expense_category": "Food"
+    }, files={"file": ("statement.csv", statement_csv(3) + b"\nnot-a-date,1,Broken")})
+    assert response.status_code == 200
+    assert response.json()["imported"] == 3
+    assert [error["line"] for error in response.json()["errors"]] == [5]
+    assert await get_balance(client, account) == 1_000_000 - 6_000
+
+@pytest.mark.parametrize("raw, expected", [
+    ("1.250.000", 1_250_000),
+    ("-1,250,000.00", -1_250_000),
+    ("(15000)", -15_000),
+    ("Rp 15.000,00", 15_000),
+    ("Rp -15.000", -15_000),
+    ("-Rp 15.000", -15_000),
+    ("15.000-", -15_000),
+    ("15.000 DB", -15_000),
+    ("15.000DR", -15_000),
+    ("15.000 CR", 15_000),
+    ("15.000 IDR", 15_000),
+    ("Rp 10.000,-", 10_000),
+    ("10.000.000,-", 10_000_000),
+    ("Rp -10.000,-", -10_000),
+    ("15.000 -", -15_000),
+])
+def test_parse_amount_signs(raw, expected):
+    assert parse_amount(raw) == expected
+
+@pytest.mark.parametrize("raw", ["Rp 15.000,50", "15.5", "-15.000 CR", "abc", "15.000 X1"])
+def test_parse_amount_rejects(raw):
+    with pytest.raises(ValueError):
+        parse_amount(raw)
+
+async def test_import_statement_signs(client, account):
+    statement = "\n".join([
+        "date,amount,description",
+        '2024-06-01,"Rp -15.000",Lunch',
+        '2024-06-02,"2.000-",Snack',
+        '2024-06-03,"3.000 DB",Fee',
+        '2024-06-04,"10.000 CR",Refund',
+        '2024-06-05,"1.000,50",Cents',
+    ]).encode()
+    response = await client.post("/transactions/import", headers=account["headers"], data={
+        "bank_id": account["bank"]["id"], "income_category": "Salary", "expense_category": "Food"
+    }, files={"file": ("statement.csv", statement)})
+    assert response.status_code == 200
+    assert response.json()["imported"] == 4
+    assert [error["line"] for error in response.json()["errors"]] == [6]
+    assert await get_balance(client, account) == 1_000_000 - 20_000 + 10_000
+
+async def test_import_rejects_sign_category_mismatch(client, account):
+    statement = "\n".join([
+        "date,amount,description,category",
+        "2024-06-01,-50.000,Refund?,Salary",
+        "2024-06-02,20.000,Lunch?,Food",
+        "2024-06-03,30.000,Bonus,Salary",
+    ]).encode()
+    response = await client.post("/transactions/import", headers=account["headers"], data={
+        "bank_id": account["bank"]["id"]
+    }, files={"file": ("statement.csv", statement)})
+    assert response.status_code == 200
+    assert response.json()["imported"] == 1
+    assert [error["line"] for error in response.json()["errors"]] == [2, 3]
+    assert await get_balance(client, account) == 1_000_000 + 30_000
+
+async def test_failed_import_reports_where_to_resume(client, account, monkeypatch):
+    # app.api.v1.transactions juga nama router di app/api/v1/__init__.py
+    transactions = importlib.import_module("app.api.v1.transactions")
+
+    calls = 0
+    insert = transactions.insert_transactions
+
+    async def fail_second_batch(*args):
+        nonlocal calls
+        calls += 1
+        if calls == 2:
+            raise RuntimeError("database went away")
+        return await insert(*args)
+
+    monkeypatch.setattr(settings, "IMPORT_BATCH_SIZE", 2)
+    monkeypatch.setattr(transactions, "insert_transactions", fail_second_batch)
+    response = await client.post("/transactions/import", headers=account["headers"], data={
+        "bank_id": account["bank"]["id"], "expense_category": "Food"
+    }, files={"file": ("statement.csv", statement_csv(5))})
+    assert response.status_code == 500
+    detail = response.json()["detail"]
+    assert detail["imported"] == 2
+    assert detail["resume_from_line"] == 4
+    assert await get_balance(client, account) == 1_000_000 - 3_000
+
+EXPORT_COLUMNS = ["id", "date", "amount", "description", "category_id", "bank_id", "created_at", "updated_at"]
+
+async def export_account(client):
+    """A UTC user with two transactions, plus another user's transaction that must not leak"""
+    account = await create_account(client, await create_user(client, timezone="UTC"))
+    other = await create_account(client, await create_user(client))
+    rows = [
+        {"date": "2024-05-01", "amount": 25_000, "description": "Lunch, with \"quotes\"",
+         "category_id": account["expense"]["id"], "bank_id": account["bank"]["id"]},
+        {"date": "2024-05-03", "amount": 1_500_000, "description": "Salary",
+         "category_id": account["income"]["id"], "bank_id": account["bank"]["id"]},
+    ]
+    assert (await client.post("/transactions/bulk", headers=account["headers"], json=rows)).status_code == 200
+    assert (await client.post("/transactions/bulk", headers=other["headers"], json=[{
+        "date": "2024-05-02", "amount": 9_999, "description": "Not mine",
+        "category_id": other["expense"]["id"], "bank_id": other["bank"]["id"]
+    }])).status_code == 200
+    return account
+
+async def test_export_csv(client):
+    account = await export_account(client)
+    response = await client.get("/transactions/export", headers=account["headers"], params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert 'filename="transactions.csv"' in response.headers["content-disposition"]
+
+    header, *rows = list(csv.reader(io.StringIO(response.text)))
+    assert header == EXPORT_COLUMNS
+    # Terbaru dulu, tanggal ISO, amount bilangan bulat tanpa pemisah ribuan
+    assert [(row[1], row[2], row[3]) for row in rows] == [
+        ("2024-05-03", "1500000", "Salary"),
+        ("2024-05-01", "25000", 'Lunch, with "quotes"'),
+    ]
+    assert all(row[5] == str(account["bank"]["id"]) for row in rows)
+    assert all(row[6].endswith("+00:00") for row in rows)
+
+async def test_export_ndjson(client):
+    account = await export_account(client)
+    response = await client.get("/transactions/export", headers=account["headers"], params={"format": "ndjson"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [list(row) for row in rows] == [EXPORT_COLUMNS] * 2
+    assert [(row["date"], row["amount"], row["description"]) for row in rows] == [
+        ("2024-05-03", 1_500_000, "Salary"),
+        ("2024-05-01", 25_000, 'Lunch, with "quotes"'),
+    ]
+    assert all(row["created_at"].endswith("+00:00") for row in rows)
+
+async def test_expanded_bank_matches_bank_endpoint(client, account):
+    # end_balance 0 dinormalisasi oleh validator BankBase, embed harus ikut
+    headers = account["headers"]
+    await client.post("/transactions/", headers=headers, json={
+        "date": "2024-07-01", "amount": 1_000_000, "description": "Everything",
+        "category_id": account["expense"]["id"], "bank_id": account["bank"]["id"]
+    })
+    listed = await client.get("/transactions/", headers=headers, params={"expand": "bank"})
+    bank = await client.get(f"/banks/{account['bank']['id']}", headers=headers)
+    assert listed.json()[0]["bank"] == bank.json()